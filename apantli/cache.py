@@ -0,0 +1,72 @@
+"""In-memory cache for deterministic (temperature 0) completion responses."""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import orjson
+
+
+# Parameters that do not affect the completion itself and are left out of
+# the cache key
+NON_SEMANTIC_KEYS = frozenset({'api_key', 'timeout', 'num_retries', 'stream', 'stream_options', 'user'})
+
+
+class ResponseCache:
+  """Bounded LRU cache of completion responses with a time-to-live.
+
+  Only non-streaming requests with temperature 0 are cached, since those
+  are the ones a provider answers the same way every time.
+  """
+
+  def __init__(self, maxsize: int = 1024, ttl: float = 3600):
+    self.maxsize = maxsize
+    self.ttl = ttl
+    self._entries: OrderedDict[bytes, tuple[float, bytes]] = OrderedDict()
+
+  def __len__(self):
+    return len(self._entries)
+
+  @staticmethod
+  def make_key(request_data: dict) -> Optional[bytes]:
+    """Build a cache key for a resolved request, or None if it is not cacheable.
+
+    Args:
+      request_data: Request dict after model resolution and filtering
+
+    Returns:
+      16-byte digest of the model, messages, and sampling parameters
+    """
+    if request_data.get('stream') or request_data.get('temperature') != 0:
+      return None
+    keyed = {k: v for k, v in request_data.items() if k not in NON_SEMANTIC_KEYS}
+    try:
+      payload = orjson.dumps(keyed, option=orjson.OPT_SORT_KEYS)
+    except TypeError:
+      # Parameters orjson cannot serialize are not worth caching on
+      return None
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+  def get(self, key: bytes) -> Optional[bytes]:
+    """Get a cached response body, or None if missing or expired."""
+    entry = self._entries.get(key)
+    if entry is None:
+      return None
+    expires_at, response = entry
+    if expires_at <= time.monotonic():
+      del self._entries[key]
+      return None
+    self._entries.move_to_end(key)
+    return response
+
+  def put(self, key: bytes, response: bytes):
+    """Store a response body, evicting the least recently used entry when full."""
+    self._entries[key] = (time.monotonic() + self.ttl, response)
+    self._entries.move_to_end(key)
+    while len(self._entries) > self.maxsize:
+      self._entries.popitem(last=False)
+
+  def clear(self):
+    """Drop all cached responses."""
+    self._entries.clear()
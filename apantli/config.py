@@ -1,9 +1,11 @@
 """Configuration management for model routing."""
 
+import io
 import os
 import logging
 import warnings
 import shutil
+import time
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Optional, Any
@@ -12,6 +14,13 @@ import yaml
 from ruamel.yaml import YAML
 
 
+# Use libyaml's C loader when PyYAML was built with it
+try:
+  from yaml import CSafeLoader as SafeLoader
+except ImportError:
+  from yaml import SafeLoader  # type: ignore[assignment]
+
+
 # Default configuration
 DEFAULT_TIMEOUT = 120  # seconds
 DEFAULT_RETRIES = 3    # number of retry attempts
@@ -118,7 +127,7 @@ class Config:
     """Load or reload configuration from file."""
     try:
       with open(self.config_path, 'r') as f:
-        config_data = yaml.safe_load(f)
+        config_data = yaml.load(f, Loader=SafeLoader)
 
       # Validate and load models
       models = {}
@@ -179,23 +188,50 @@ class Config:
     """List all configured model names."""
     return list(self.models.keys())
 
+  def get_enabled_models(self) -> frozenset:
+    """Get the names of models enabled for API requests."""
+    return frozenset(name for name, model in self.models.items() if model.enabled)
+
   def get_model_map(self, defaults: Optional[Dict[str, Any]] = None) -> Dict[str, dict]:
     """Get all models as a dict mapping names to litellm parameters.
 
+    API keys are resolved from the environment here, once per config load,
+    so the map holds the actual key (empty if the variable is unset; a
+    warning was already issued when the model was validated).
+
     Args:
       defaults: Default values for timeout, num_retries, etc.
 
     Returns:
       Dict mapping model names to litellm_params dicts
     """
-    return {
-      name: model.to_litellm_params(defaults)
-      for name, model in self.models.items()
-    }
+    return {name: self.get_model_entry(name, defaults) for name in self.models}
+
+  def get_model_entry(self, model_name: str, defaults: Optional[Dict[str, Any]] = None) -> dict:
+    """Get one model's entry of get_model_map().
+
+    Args:
+      model_name: Configured model name
+      defaults: Default values for timeout, num_retries, etc.
 
-  def backup_config(self) -> Path:
+    Returns:
+      litellm_params dict with the API key resolved
+
+    Raises:
+      KeyError: If the model is not configured
+    """
+    model = self.models[model_name]
+    params = model.to_litellm_params(defaults)
+    params['api_key'] = model.get_api_key()
+    return params
+
+  def backup_config(self, min_interval: float = 0) -> Path:
     """Create a backup of the config file.
 
+    Args:
+      min_interval: Reuse the newest backup instead of copying again if it
+        is younger than this many seconds
+
     Returns:
       Path to the backup file
 
@@ -206,6 +242,11 @@ class Config:
     if not config_path.exists():
       raise FileNotFoundError(f"Config file not found: {self.config_path}")
 
+    if min_interval > 0:
+      backups = self._list_backups()
+      if backups and time.time() - backups[0].stat().st_mtime < min_interval:
+        return backups[0]
+
     # Create backup with timestamp
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     backup_path = config_path.with_suffix(f'.backup.{timestamp}.yaml')
@@ -219,24 +260,24 @@ class Config:
 
     return backup_path
 
-  def _cleanup_old_backups(self, keep: int = 5):
-    """Remove old backup files, keeping the most recent ones.
-
-    Args:
-      keep: Number of backups to keep
-    """
+  def _list_backups(self) -> list[Path]:
+    """List backup files of the config file, newest first."""
     config_path = Path(self.config_path)
     backup_pattern = f"{config_path.stem}.backup.*.yaml"
-
-    # Find all backups
-    backups = sorted(
+    return sorted(
       config_path.parent.glob(backup_pattern),
       key=lambda p: p.stat().st_mtime,
       reverse=True
     )
 
+  def _cleanup_old_backups(self, keep: int = 5):
+    """Remove old backup files, keeping the most recent ones.
+
+    Args:
+      keep: Number of backups to keep
+    """
     # Delete old ones
-    for old_backup in backups[keep:]:
+    for old_backup in self._list_backups()[keep:]:
       old_backup.unlink()
       logging.debug(f"Removed old backup: {old_backup}")
 
@@ -302,9 +343,12 @@ class Config:
       # Update data
       data['model_list'] = model_list
 
-      # Write to file
+      # Serialize to memory first so the file gets one write instead of
+      # many small ones, and a dump error cannot leave it half-written
+      buffer = io.StringIO()
+      yaml_handler.dump(data, buffer)
       with open(config_path, 'w') as f:
-        yaml_handler.dump(data, f)
+        f.write(buffer.getvalue())
 
       logging.info(f"Wrote configuration to {self.config_path}")
 
@@ -1,13 +1,198 @@
 """Database operations for SQLite request logging."""
 
 import aiosqlite
-import json
+import asyncio
+import logging
 from dataclasses import dataclass
-from datetime import datetime, UTC
-from typing import Optional
+from datetime import datetime, timedelta, UTC
+from typing import Any, Optional
 from contextlib import asynccontextmanager
+from pathlib import Path
 
 import litellm
+import orjson
+
+from apantli.utils import build_range_filter, build_timezone_modifier
+
+
+INSERT_REQUEST_SQL = """
+  INSERT INTO requests
+  (timestamp, model, provider, prompt_tokens, completion_tokens, total_tokens,
+   cost, duration_ms, request_data, response_data, error)
+  VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Hourly rollup of successful requests per model and provider, kept up to
+# date by log_requests_batch() so /stats sums buckets instead of scanning
+# every request. hour_ts is the first 13 characters of the stored
+# timestamp (YYYY-MM-DDTHH); provider is '' when unknown, since NULLs
+# never conflict in the primary key. The perf_* and tps_* columns cover
+# only requests with completion tokens and a duration, as the performance
+# metrics do.
+STATS_BUCKET_COLUMNS = """
+  hour_ts, model, provider, requests, cost, prompt_tokens, completion_tokens,
+  total_tokens, duration_ms_sum, perf_requests, perf_cost, perf_duration_ms_sum,
+  tps_sum, tps_min, tps_max
+"""
+
+UPSERT_STATS_BUCKET_SQL = f"""
+  INSERT INTO stats_bucket ({STATS_BUCKET_COLUMNS})
+  VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+  ON CONFLICT (hour_ts, model, provider) DO UPDATE SET
+    requests = requests + excluded.requests,
+    cost = cost + excluded.cost,
+    prompt_tokens = prompt_tokens + excluded.prompt_tokens,
+    completion_tokens = completion_tokens + excluded.completion_tokens,
+    total_tokens = total_tokens + excluded.total_tokens,
+    duration_ms_sum = duration_ms_sum + excluded.duration_ms_sum,
+    perf_requests = perf_requests + excluded.perf_requests,
+    perf_cost = perf_cost + excluded.perf_cost,
+    perf_duration_ms_sum = perf_duration_ms_sum + excluded.perf_duration_ms_sum,
+    tps_sum = tps_sum + excluded.tps_sum,
+    tps_min = CASE WHEN tps_min IS NULL OR excluded.tps_min < tps_min THEN excluded.tps_min ELSE tps_min END,
+    tps_max = CASE WHEN tps_max IS NULL OR excluded.tps_max > tps_max THEN excluded.tps_max ELSE tps_max END
+"""
+
+# Completion tokens per second of one request, NULL when it has no
+# completion tokens or duration (and is left out of performance metrics)
+TOKENS_PER_SEC_SQL = """
+  CASE WHEN completion_tokens > 0 AND duration_ms > 0
+  THEN completion_tokens * 1000.0 / duration_ms END
+"""
+
+# Fills stats_bucket from existing rows, for databases created before it
+BACKFILL_STATS_BUCKET_SQL = f"""
+  INSERT INTO stats_bucket ({STATS_BUCKET_COLUMNS})
+  SELECT substr(timestamp, 1, 13), model, COALESCE(provider, ''), COUNT(*),
+         COALESCE(SUM(cost), 0), COALESCE(SUM(prompt_tokens), 0),
+         COALESCE(SUM(completion_tokens), 0), COALESCE(SUM(total_tokens), 0),
+         COALESCE(SUM(duration_ms), 0), COUNT(tps),
+         COALESCE(SUM(cost) FILTER (WHERE tps IS NOT NULL), 0),
+         COALESCE(SUM(duration_ms) FILTER (WHERE tps IS NOT NULL), 0),
+         COALESCE(SUM(tps), 0), MIN(tps), MAX(tps)
+  FROM (
+    SELECT timestamp, model, provider, cost, prompt_tokens, completion_tokens,
+           total_tokens, duration_ms, {TOKENS_PER_SEC_SQL} AS tps
+    FROM requests
+    WHERE error IS NULL
+  )
+  GROUP BY 1, 2, 3
+"""
+
+# Request fields whose values are never written to the database
+REDACTED_KEYS = ('api_key',)
+REDACTED_VALUE = 'sk-redacted'
+
+# Per-connection settings: WAL makes synchronous=NORMAL safe (no fsync on
+# each commit), and busy_timeout lets readers and the writer wait for
+# each other instead of failing with "database is locked"
+CONNECTION_PRAGMAS = (
+  "PRAGMA synchronous=NORMAL",
+  "PRAGMA temp_store=MEMORY",
+  "PRAGMA mmap_size=268435456",
+  "PRAGMA cache_size=-65536",
+  "PRAGMA busy_timeout=5000",
+)
+
+# Read-only connections kept open by connect() for dashboard queries
+READ_POOL_SIZE = 5
+
+# Background writer tuning: rows queued beyond LOG_QUEUE_SIZE are written
+# directly; each batch waits LOG_FLUSH_INTERVAL seconds to collect up to
+# LOG_BATCH_SIZE rows into a single transaction
+LOG_QUEUE_SIZE = 10000
+LOG_BATCH_SIZE = 100
+LOG_FLUSH_INTERVAL = 0.05
+
+
+def utc_timestamp() -> str:
+  """Current UTC time in the stored timestamp format (ISO 8601 with Z).
+
+  Formatted from a naive datetime so there is no '+00:00' to replace;
+  milliseconds are all JavaScript's Date keeps anyway.
+  """
+  return datetime.now(UTC).replace(tzinfo=None).isoformat(timespec='milliseconds') + 'Z'
+
+
+def split_stats_range(start_utc: Optional[str], end_utc: Optional[str]) -> tuple[str, list, str, list]:
+  """Split a UTC range into whole hours and the partial hours at its edges.
+
+  The whole hours are read from stats_bucket; the edges (less than an hour
+  each) are read from requests, so the combined result is exact.
+
+  Args:
+    start_utc: Inclusive range start, or None
+    end_utc: Exclusive range end, or None
+
+  Returns:
+    Tuple of (stats_bucket filter, params, requests filter, params)
+  """
+  first_hour = None
+  if start_utc:
+    start = datetime.fromisoformat(start_utc).replace(tzinfo=None)
+    aligned = start.replace(minute=0, second=0, microsecond=0)
+    first_hour = (aligned if aligned == start else aligned + timedelta(hours=1)).strftime('%Y-%m-%dT%H')
+  end_hour = end_utc[:13] if end_utc else None
+
+  if first_hour and end_hour and first_hour >= end_hour:
+    # No whole hour in range
+    edge_filter, edge_params = build_range_filter(start_utc, end_utc)
+    return "AND 0", [], edge_filter, edge_params
+
+  bucket_filter, bucket_params = build_range_filter(first_hour, end_hour, column='hour_ts')
+  edges = []
+  edge_params = []
+  if start_utc:
+    edges.append("(timestamp >= ? AND timestamp < ?)")
+    edge_params.extend([start_utc, first_hour])
+  if end_utc:
+    edges.append("(timestamp >= ? AND timestamp < ?)")
+    edge_params.extend([end_hour, end_utc])
+  edge_filter = f"AND ({' OR '.join(edges)})" if edges else "AND 0"
+  return bucket_filter, bucket_params, edge_filter, edge_params
+
+
+def build_stats_source(start_utc: str, end_utc: str,
+                       timezone_offset: Optional[int] = None) -> tuple[str, list]:
+  """Build a subquery of successful usage in a UTC range, for grouping by date or hour.
+
+  Rows have local_ts (the timestamp shifted to the timezone), provider,
+  model, requests, cost and tokens columns. Whole hours come from
+  stats_bucket (timestamped at the start of the hour) and the partial
+  hours at the edges from requests. A timezone that is not a whole number
+  of hours from UTC splits hour buckets across local dates and hours, so
+  then every row is read from requests.
+
+  The timezone is bound as a datetime modifier like the range, so the
+  SQL text only depends on which parts of the range are read.
+
+  Args:
+    start_utc: Inclusive UTC timestamp for range start
+    end_utc: Exclusive UTC timestamp for range end
+    timezone_offset: Minutes from UTC, or None for UTC
+
+  Returns:
+    Tuple of (subquery SQL, params)
+  """
+  tz_mod = build_timezone_modifier(timezone_offset or 0)
+  if not timezone_offset or timezone_offset % 60 == 0:
+    bucket_filter, bucket_params, edge_filter, edge_params = split_stats_range(start_utc, end_utc)
+  else:
+    bucket_filter, bucket_params = "AND 0", []
+    edge_filter, edge_params = build_range_filter(start_utc, end_utc)
+  return f"""
+    SELECT datetime(timestamp, ?) AS local_ts, provider, model, requests, cost, tokens
+    FROM (
+      SELECT hour_ts || ':00' AS timestamp, NULLIF(provider, '') AS provider, model,
+             requests, cost, total_tokens AS tokens
+      FROM stats_bucket
+      WHERE 1 {bucket_filter}
+      UNION ALL
+      SELECT timestamp, provider, model, 1, cost, total_tokens
+      FROM requests
+      WHERE error IS NULL {edge_filter}
+    )
+  """, [tz_mod, *bucket_params, *edge_params]
 
 
 @dataclass
@@ -24,6 +209,7 @@ class RequestFilter:
   search: Optional[str] = None
   sort_by: Optional[str] = None  # timestamp, model, total_tokens, cost, duration_ms
   sort_dir: str = "desc"  # asc or desc
+  before: Optional[str] = None  # only requests older than this timestamp (keyset paging)
 
   def __post_init__(self):
     """Initialize mutable defaults."""
@@ -36,20 +222,98 @@ class Database:
 
   def __init__(self, path: str):
     self.path = path
+    self._log_queue: Optional[asyncio.Queue] = None
+    self._writer_task: Optional[asyncio.Task] = None
+    self._write_conn: Optional[aiosqlite.Connection] = None
+    self._write_lock = asyncio.Lock()
+    self._read_pool: Optional[asyncio.Queue] = None
+    # Bumped after every write so callers can tell cached query results
+    # are out of date
+    self.generation = 0
+
+  async def _connect(self, read_only: bool = False) -> aiosqlite.Connection:
+    """Open a connection with CONNECTION_PRAGMAS applied."""
+    if read_only:
+      conn = await aiosqlite.connect(f"{Path(self.path).resolve().as_uri()}?mode=ro", uri=True)
+    else:
+      conn = await aiosqlite.connect(self.path)
+    for pragma in CONNECTION_PRAGMAS:
+      await conn.execute(pragma)
+    return conn
+
+  async def connect(self, read_pool_size: int = READ_POOL_SIZE):
+    """Open the shared write connection and a pool of read-only connections.
+
+    Until this is called (and after close()), every operation opens and
+    closes its own connection, which is fine for scripts and tests.
+
+    Args:
+      read_pool_size: Number of read-only connections for queries
+    """
+    if self._write_conn is not None:
+      return
+    self._write_conn = await self._connect()
+    pool: asyncio.Queue = asyncio.Queue()
+    for _ in range(read_pool_size):
+      pool.put_nowait(await self._connect(read_only=True))
+    self._read_pool = pool
+
+  async def close(self):
+    """Close the connections opened by connect()."""
+    if self._read_pool is not None:
+      while not self._read_pool.empty():
+        await self._read_pool.get_nowait().close()
+      self._read_pool = None
+    if self._write_conn is not None:
+      await self._write_conn.close()
+      self._write_conn = None
 
   @asynccontextmanager
   async def _get_connection(self):
-    """Context manager for database connections."""
-    conn = await aiosqlite.connect(self.path)
+    """Context manager for connections that write; commits on success."""
+    if self._write_conn is not None:
+      # One shared connection, so writers take turns to keep their
+      # transactions separate
+      async with self._write_lock:
+        try:
+          yield self._write_conn
+          await self._write_conn.commit()
+        except BaseException:
+          await self._write_conn.rollback()
+          raise
+      return
+
+    conn = await self._connect()
     try:
       yield conn
       await conn.commit()
     finally:
       await conn.close()
 
+  @asynccontextmanager
+  async def _read_connection(self):
+    """Context manager for query connections, borrowed from the read pool."""
+    if self._read_pool is None:
+      async with self._get_connection() as conn:
+        yield conn
+      return
+
+    conn = await self._read_pool.get()
+    try:
+      yield conn
+    finally:
+      self._read_pool.put_nowait(conn)
+
   async def init(self):
     """Initialize SQLite database with requests table."""
     async with self._get_connection() as conn:
+      # journal_mode is stored in the database file, so setting it once
+      # here applies to every later connection
+      async with conn.execute("PRAGMA journal_mode=WAL") as cursor:
+        journal_mode = (await cursor.fetchone())[0]
+      if journal_mode != 'wal':
+        logging.warning(f"SQLite WAL mode unavailable for {self.path}, using journal_mode={journal_mode}")
+
       await conn.execute("""
         CREATE TABLE IF NOT EXISTS requests (
           id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -67,6 +331,35 @@ class Database:
         )
       """)
 
+      # A stats_bucket from before the performance columns is rebuilt
+      async with conn.execute("PRAGMA table_info(stats_bucket)") as cursor:
+        bucket_columns = {row[1] for row in await cursor.fetchall()}
+      has_stats_bucket = 'tps_max' in bucket_columns
+      if bucket_columns and not has_stats_bucket:
+        await conn.execute("DROP TABLE stats_bucket")
+      await conn.execute("""
+        CREATE TABLE IF NOT EXISTS stats_bucket (
+          hour_ts TEXT NOT NULL,
+          model TEXT NOT NULL,
+          provider TEXT NOT NULL,
+          requests INTEGER NOT NULL,
+          cost REAL NOT NULL,
+          prompt_tokens INTEGER NOT NULL,
+          completion_tokens INTEGER NOT NULL,
+          total_tokens INTEGER NOT NULL,
+          duration_ms_sum INTEGER NOT NULL,
+          perf_requests INTEGER NOT NULL,
+          perf_cost REAL NOT NULL,
+          perf_duration_ms_sum INTEGER NOT NULL,
+          tps_sum REAL NOT NULL,
+          tps_min REAL,
+          tps_max REAL,
+          PRIMARY KEY (hour_ts, model, provider)
+        ) WITHOUT ROWID
+      """)
+      if not has_stats_bucket:
+        await conn.execute(BACKFILL_STATS_BUCKET_SQL)
+
       # Create indexes for faster date-based queries
       await conn.execute("""
         CREATE INDEX IF NOT EXISTS idx_timestamp
@@ -83,17 +376,70 @@ class Database:
         WHERE error IS NULL
       """)
 
-  async def log_request(self, model: str, provider: str, response: Optional[dict],
-                       duration_ms: int, request_data: dict,
-                       error: Optional[str] = None):
-    """Log a request to SQLite."""
-    async with self._get_connection() as conn:
-      usage = response.get('usage', {}) if response else {}
-      prompt_tokens = usage.get('prompt_tokens', 0)
-      completion_tokens = usage.get('completion_tokens', 0)
-      total_tokens = usage.get('total_tokens', 0)
+      # Partial indexes matching the dashboard queries, which all split on
+      # error IS NULL: time-ranged and time-ordered successful requests,
+      # the recent errors list, and the model/provider groupings
+      await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_success_timestamp
+        ON requests(timestamp)
+        WHERE error IS NULL
+      """)
+      await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_error_timestamp
+        ON requests(timestamp)
+        WHERE error IS NOT NULL
+      """)
+      await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_model
+        ON requests(model)
+        WHERE error IS NULL
+      """)
+      await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_provider
+        ON requests(provider)
+        WHERE error IS NULL
+      """)
+
+      # Covering index for the stats queries that still read individual
+      # rows (the partial hours around stats_bucket, daily and hourly
+      # breakdowns): they are answered from the index
+      # alone, without reading table pages full of request/response JSON.
+      # error is always NULL here but must be listed for SQLite to treat
+      # the index as covering queries that filter on it
+      await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_success_stats
+        ON requests(timestamp, model, provider, cost, prompt_tokens,
+                    completion_tokens, total_tokens, duration_ms, error)
+        WHERE error IS NULL
+      """)
 
-      # Calculate cost using LiteLLM
+      # Refresh planner statistics where they are missing or stale, so
+      # the new indexes are actually chosen
+      await conn.execute("PRAGMA optimize")
+
+  @staticmethod
+  def build_request_row(model: str, provider: str, response: Optional[Any],
+                        duration_ms: int, request_data: dict,
+                        error: Optional[str] = None,
+                        cost: Optional[float] = None,
+                        timestamp: Optional[str] = None) -> tuple:
+    """Build a requests table row (in INSERT_REQUEST_SQL column order).
+
+    The cost is calculated from the response unless given explicitly
+    (e.g. 0.0 for responses served from the response cache). The timestamp
+    defaults to now; queued rows pass the time they were logged. Values of
+    REDACTED_KEYS in request_data are replaced before serializing.
+    A pydantic response object is converted to a dict here.
+    """
+    if response is not None and not isinstance(response, dict):
+      response = response.model_dump()
+    usage = response.get('usage', {}) if response else {}
+    prompt_tokens = usage.get('prompt_tokens', 0)
+    completion_tokens = usage.get('completion_tokens', 0)
+    total_tokens = usage.get('total_tokens', 0)
+
+    # Calculate cost using LiteLLM
+    if cost is None:
       cost = 0.0
       if response:
         try:
@@ -101,24 +447,138 @@ class Database:
         except Exception:
           pass
 
-      await conn.execute("""
-        INSERT INTO requests
-        (timestamp, model, provider, prompt_tokens, completion_tokens, total_tokens,
-         cost, duration_ms, request_data, response_data, error)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-      """, (
-        datetime.now(UTC).isoformat().replace('+00:00', 'Z'),
-        model,
-        provider,
-        prompt_tokens,
-        completion_tokens,
-        total_tokens,
-        cost,
-        duration_ms,
-        json.dumps(request_data),
-        json.dumps(response) if response else None,
-        error
-      ))
+    # Shallow copy only when there is something to redact; messages are
+    # shared, not copied
+    redacted = {key: REDACTED_VALUE for key in REDACTED_KEYS if request_data.get(key)}
+    if redacted:
+      request_data = {**request_data, **redacted}
+
+    return (
+      timestamp or utc_timestamp(),
+      model,
+      provider,
+      prompt_tokens,
+      completion_tokens,
+      total_tokens,
+      cost,
+      duration_ms,
+      orjson.dumps(request_data, option=orjson.OPT_NON_STR_KEYS).decode(),
+      orjson.dumps(response, option=orjson.OPT_NON_STR_KEYS).decode() if response else None,
+      error
+    )
+
+  async def log_request(self, model: str, provider: str, response: Optional[Any],
+                       duration_ms: int, request_data: dict,
+                       error: Optional[str] = None, cost: Optional[float] = None,
+                       timestamp: Optional[str] = None):
+    """Log a request to SQLite.
+
+    The row is stamped with the current time unless a timestamp (in
+    utc_timestamp() format) is given.
+
+    While the background writer is running (see start_writer()) the
+    arguments are queued as-is, and cost calculation and JSON serialization
+    happen in the writer, off the response path. Callers must not modify
+    response or request_data afterwards. Without the writer the row is
+    written immediately.
+    """
+    entry = (model, provider, response, duration_ms, request_data, error, cost, timestamp or utc_timestamp())
+    if self._log_queue is not None:
+      try:
+        self._log_queue.put_nowait(entry)
+        return
+      except asyncio.QueueFull:
+        logging.warning("Request log queue full, writing directly")
+    await self.log_requests_batch([self.build_request_row(*entry)])
+
+  def start_writer(self):
+    """Start the background task that batches queued log rows."""
+    if self._writer_task is None:
+      self._log_queue = asyncio.Queue(maxsize=LOG_QUEUE_SIZE)
+      self._writer_task = asyncio.create_task(self._run_writer(self._log_queue))
+
+  async def stop_writer(self):
+    """Flush queued rows and stop the background writer."""
+    queue, task = self._log_queue, self._writer_task
+    if queue is None or task is None:
+      return
+    # New log_request() calls write directly from here on
+    self._log_queue = None
+    self._writer_task = None
+    await queue.put(None)
+    await task
+
+  async def _run_writer(self, queue: asyncio.Queue):
+    """Drain the log queue in batches until a None sentinel arrives."""
+    stopping = False
+    while not stopping:
+      entry = await queue.get()
+      if entry is None:
+        break
+      entries = [entry]
+
+      # Give concurrent requests a moment to add to this batch
+      await asyncio.sleep(LOG_FLUSH_INTERVAL)
+      while len(entries) < LOG_BATCH_SIZE and not queue.empty():
+        entry = queue.get_nowait()
+        if entry is None:
+          stopping = True
+          break
+        entries.append(entry)
+
+      try:
+        await self.log_requests_batch([self.build_request_row(*entry) for entry in entries])
+      except Exception:
+        logging.exception(f"Failed to write {len(entries)} request log rows")
+
+  @staticmethod
+  def build_stats_bucket_rows(rows: list[tuple]) -> list[tuple]:
+    """Sum request rows into stats_bucket increments (in UPSERT_STATS_BUCKET_SQL order).
+
+    Failed requests are left out, as they are from all stats.
+    """
+    buckets: dict[tuple, list] = {}
+    for (timestamp, model, provider, prompt_tokens, completion_tokens, total_tokens,
+         cost, duration_ms, _, _, error) in rows:
+      if error is not None:
+        continue
+      bucket = buckets.get((timestamp[:13], model, provider or ''))
+      if bucket is None:
+        bucket = buckets[(timestamp[:13], model, provider or '')] = [0, 0.0, 0, 0, 0, 0, 0, 0.0, 0, 0.0, None, None]
+      bucket[0] += 1
+      bucket[1] += cost or 0.0
+      bucket[2] += prompt_tokens or 0
+      bucket[3] += completion_tokens or 0
+      bucket[4] += total_tokens or 0
+      bucket[5] += duration_ms or 0
+      if completion_tokens and completion_tokens > 0 and duration_ms and duration_ms > 0:
+        tokens_per_sec = completion_tokens * 1000.0 / duration_ms
+        bucket[6] += 1
+        bucket[7] += cost or 0.0
+        bucket[8] += duration_ms
+        bucket[9] += tokens_per_sec
+        bucket[10] = tokens_per_sec if bucket[10] is None else min(bucket[10], tokens_per_sec)
+        bucket[11] = tokens_per_sec if bucket[11] is None else max(bucket[11], tokens_per_sec)
+    return [(*key, *totals) for key, totals in buckets.items()]
+
+  async def log_requests_batch(self, rows: list[tuple]):
+    """Insert several request rows in a single transaction.
+
+    executemany() reuses one prepared INSERT for every row and the whole
+    batch shares a single commit, which is much cheaper than committing
+    each row on its own. stats_bucket is updated in the same transaction.
+
+    Args:
+      rows: Row tuples from build_request_row()
+    """
+    if not rows:
+      return
+    bucket_rows = self.build_stats_bucket_rows(rows)
+    async with self._get_connection() as conn:
+      await conn.executemany(INSERT_REQUEST_SQL, rows)
+      if bucket_rows:
+        await conn.executemany(UPSERT_STATS_BUCKET_SQL, bucket_rows)
+    self.generation += 1
 
   async def get_requests(self, filters: RequestFilter):
     """Get requests with filtering and pagination.
@@ -129,7 +589,7 @@ class Database:
     Returns:
       Dict with requests array, total count, aggregates, and pagination info
     """
-    async with self._get_connection() as conn:
+    async with self._read_connection() as conn:
       # Build attribute filters
       where_conditions = []
       params: list = list(filters.time_params or [])  # Start with time filter params
@@ -150,6 +610,10 @@ class Database:
         where_conditions.append("cost <= ?")
         params.append(filters.max_cost)
 
+      if filters.before:
+        where_conditions.append("timestamp < ?")
+        params.append(filters.before)
+
       if filters.search:
         where_conditions.append("(model LIKE ? OR request_data LIKE ? OR response_data LIKE ?)")
         search_param = f"%{filters.search}%"
@@ -185,16 +649,24 @@ class Database:
       }
       sort_column = sort_column_map.get(filters.sort_by or 'timestamp', 'timestamp')
       sort_direction = 'ASC' if filters.sort_dir == 'asc' else 'DESC'
-      order_by = f"ORDER BY {sort_column} {sort_direction}"
+      # id breaks ties so pages neither repeat nor skip rows
+      order_by = f"ORDER BY {sort_column} {sort_direction}, id {sort_direction}"
 
-      # Get paginated results
+      # Get paginated results. The page's ids are found first and only
+      # those rows are read in full, so rows skipped by OFFSET never load
+      # their request/response JSON.
       cursor = await conn.execute(f"""
         SELECT timestamp, model, provider, prompt_tokens, completion_tokens, total_tokens,
                cost, duration_ms, request_data, response_data
         FROM requests
-        WHERE error IS NULL {filter_clause}
+        WHERE id IN (
+          SELECT id
+          FROM requests
+          WHERE error IS NULL {filter_clause}
+          {order_by}
+          LIMIT {filters.limit} OFFSET {filters.offset}
+        )
         {order_by}
-        LIMIT {filters.limit} OFFSET {filters.offset}
       """, params)
       rows = await cursor.fetchall()
 
@@ -222,81 +694,87 @@ class Database:
         "limit": filters.limit
       }
 
-  async def get_stats(self, time_filter: str = "", time_params: Optional[list] = None):
+  async def get_stats(self, start_utc: Optional[str] = None, end_utc: Optional[str] = None):
     """Get usage statistics with optional time filtering.
 
+    Totals, the model/provider breakdowns and performance metrics come
+    from stats_bucket for whole hours and from requests for the partial
+    hours at either end of the range (see split_stats_range()).
+
     Args:
-      time_filter: SQL WHERE clause fragment from build_time_filter()
-      time_params: Parameters for time filter placeholders
+      start_utc: Inclusive UTC timestamp for range start, or None
+      end_utc: Exclusive UTC timestamp for range end, or None
 
     Returns:
       Dict with totals, by_model, by_provider, performance, and recent_errors
     """
-    if time_params is None:
-      time_params = []
-
-    async with self._get_connection() as conn:
-      # Total stats
-      cursor = await conn.execute(f"""
-        SELECT
-          COUNT(*) as total_requests,
-          SUM(cost) as total_cost,
-          SUM(prompt_tokens) as total_prompt_tokens,
-          SUM(completion_tokens) as total_completion_tokens,
-          AVG(duration_ms) as avg_duration_ms
-        FROM requests
-        WHERE error IS NULL {time_filter}
-      """, time_params)
-      totals = await cursor.fetchone()
+    time_filter, time_params = build_range_filter(start_utc, end_utc)
+    bucket_filter, bucket_params, edge_filter, edge_params = split_stats_range(start_utc, end_utc)
 
-      # By model (include provider for segmented visualization)
+    async with self._read_connection() as conn:
+      # Per model and provider totals
       cursor = await conn.execute(f"""
         SELECT
           model,
           provider,
-          COUNT(*) as requests,
-          SUM(cost) as cost,
-          SUM(total_tokens) as tokens
-        FROM requests
-        WHERE error IS NULL {time_filter}
+          SUM(requests),
+          SUM(cost),
+          SUM(prompt_tokens),
+          SUM(completion_tokens),
+          SUM(total_tokens),
+          SUM(duration_ms_sum),
+          SUM(perf_requests),
+          SUM(perf_cost),
+          SUM(perf_duration_ms_sum),
+          SUM(tps_sum),
+          MIN(tps_min),
+          MAX(tps_max)
+        FROM (
+          SELECT {STATS_BUCKET_COLUMNS}
+          FROM stats_bucket
+          WHERE 1 {bucket_filter}
+          UNION ALL
+          SELECT NULL, model, provider, 1, cost, prompt_tokens, completion_tokens,
+                 total_tokens, duration_ms, tps IS NOT NULL, IIF(tps IS NULL, 0, cost),
+                 IIF(tps IS NULL, 0, duration_ms), COALESCE(tps, 0), tps, tps
+          FROM (
+            SELECT model, COALESCE(provider, '') AS provider, cost, prompt_tokens,
+                   completion_tokens, total_tokens, duration_ms, {TOKENS_PER_SEC_SQL} AS tps
+            FROM requests
+            WHERE error IS NULL {edge_filter}
+          )
+        )
         GROUP BY model, provider
-        ORDER BY cost DESC
-      """, time_params)
+        ORDER BY 4 DESC
+      """, bucket_params + edge_params)
       by_model = await cursor.fetchall()
 
-      # By provider
-      cursor = await conn.execute(f"""
-        SELECT
-          provider,
-          COUNT(*) as requests,
-          SUM(cost) as cost,
-          SUM(total_tokens) as tokens
-        FROM requests
-        WHERE error IS NULL {time_filter}
-        GROUP BY provider
-        ORDER BY cost DESC
-      """, time_params)
-      by_provider = await cursor.fetchall()
-
-      # Model performance metrics
-      cursor = await conn.execute(f"""
-        SELECT
-          model,
-          COUNT(*) as requests,
-          AVG(CAST(completion_tokens AS REAL) / (CAST(duration_ms AS REAL) / 1000.0)) as avg_tokens_per_sec,
-          AVG(duration_ms) as avg_duration_ms,
-          MIN(CAST(completion_tokens AS REAL) / (CAST(duration_ms AS REAL) / 1000.0)) as min_tokens_per_sec,
-          MAX(CAST(completion_tokens AS REAL) / (CAST(duration_ms AS REAL) / 1000.0)) as max_tokens_per_sec,
-          AVG(cost) as avg_cost_per_request
-        FROM requests
-        WHERE error IS NULL
-          AND completion_tokens > 0
-          AND duration_ms > 0
-          {time_filter}
-        GROUP BY model
-        ORDER BY avg_tokens_per_sec DESC
-      """, time_params)
-      performance = await cursor.fetchall()
+      totals = [0, 0.0, 0, 0, 0]
+      by_provider: dict[Optional[str], list] = {}
+      by_model_perf: dict[str, list] = {}
+      for (model, provider, requests, cost, prompt_tokens, completion_tokens, tokens, duration_ms,
+           perf_requests, perf_cost, perf_duration_ms, tps_sum, tps_min, tps_max) in by_model:
+        totals[0] += requests
+        totals[1] += cost or 0.0
+        totals[2] += prompt_tokens or 0
+        totals[3] += completion_tokens or 0
+        totals[4] += duration_ms or 0
+        provider_totals = by_provider.setdefault(provider or None, [0, 0.0, 0])
+        provider_totals[0] += requests
+        provider_totals[1] += cost or 0.0
+        provider_totals[2] += tokens or 0
+        if not perf_requests:
+          continue
+        perf = by_model_perf.get(model)
+        if perf is None:
+          by_model_perf[model] = [perf_requests, tps_sum, perf_duration_ms, tps_min, tps_max, perf_cost]
+        else:
+          perf[0] += perf_requests
+          perf[1] += tps_sum
+          perf[2] += perf_duration_ms
+          perf[3] = min(perf[3], tps_min)
+          perf[4] = max(perf[4], tps_max)
+          perf[5] += perf_cost
 
       # Recent errors
       cursor = await conn.execute(f"""
@@ -308,102 +786,96 @@ class Database:
       """, time_params)
       errors = await cursor.fetchall()
 
+      performance = [
+        {
+          "model": model,
+          "requests": requests,
+          "avg_tokens_per_sec": round(tps_sum / requests, 2),
+          "avg_duration_ms": round(duration_ms / requests, 2),
+          "min_tokens_per_sec": round(tps_min, 2),
+          "max_tokens_per_sec": round(tps_max, 2),
+          "avg_cost_per_request": round(cost / requests, 6)
+        }
+        for model, (requests, tps_sum, duration_ms, tps_min, tps_max, cost) in by_model_perf.items()
+      ]
+      performance.sort(key=lambda entry: entry['avg_tokens_per_sec'], reverse=True)
+
       return {
         "totals": {
-          "requests": totals[0] or 0,
-          "cost": round(totals[1] or 0, 4),
-          "prompt_tokens": totals[2] or 0,
-          "completion_tokens": totals[3] or 0,
-          "avg_duration_ms": round(totals[4] or 0, 2)
+          "requests": totals[0],
+          "cost": round(totals[1], 4),
+          "prompt_tokens": totals[2],
+          "completion_tokens": totals[3],
+          "avg_duration_ms": round(totals[4] / totals[0], 2) if totals[0] else 0
         },
         "by_model": [
-          {"model": row[0], "provider": row[1], "requests": row[2], "cost": round(row[3] or 0, 4), "tokens": row[4]}
+          {"model": row[0], "provider": row[1] or None, "requests": row[2], "cost": round(row[3] or 0, 4), "tokens": row[6]}
           for row in by_model
         ],
         "by_provider": [
-          {"provider": row[0], "requests": row[1], "cost": round(row[2] or 0, 4), "tokens": row[3]}
-          for row in by_provider
-        ],
-        "performance": [
-          {
-            "model": row[0],
-            "requests": row[1],
-            "avg_tokens_per_sec": round(row[2] or 0, 2),
-            "avg_duration_ms": round(row[3] or 0, 2),
-            "min_tokens_per_sec": round(row[4] or 0, 2),
-            "max_tokens_per_sec": round(row[5] or 0, 2),
-            "avg_cost_per_request": round(row[6] or 0, 6)
-          }
-          for row in performance
+          {"provider": provider, "requests": values[0], "cost": round(values[1], 4), "tokens": values[2]}
+          for provider, values in sorted(by_provider.items(), key=lambda item: item[1][1], reverse=True)
         ],
+        "performance": performance,
         "recent_errors": [
           {"timestamp": row[0], "model": row[1], "error": row[2]}
           for row in errors
         ]
       }
 
-  async def get_daily_stats(self, start_date: str, end_date: str, where_filter: str, date_expr: str, where_params: Optional[list] = None):
+  async def get_daily_stats(self, start_utc: str, end_utc: str,
+                            timezone_offset: Optional[int] = None):
     """Get daily aggregated statistics with model breakdown.
 
+    Sums stats_bucket hours where it can (see build_stats_source()). Day
+    totals are window sums over the per-model groups, so each row already
+    carries its day's totals and Python only nests the rows.
+
     Args:
-      start_date: ISO date for default calculations (YYYY-MM-DD)
-      end_date: ISO date for default calculations (YYYY-MM-DD)
-      where_filter: SQL WHERE clause (without WHERE keyword)
-      date_expr: SQL expression for grouping by date with timezone
-      where_params: Parameters for where_filter placeholders
+      start_utc: Inclusive UTC timestamp for range start
+      end_utc: Exclusive UTC timestamp for range end
+      timezone_offset: Minutes from UTC for grouping by local date, or None for UTC
 
     Returns:
       Dict with daily array, total_days, total_cost, total_requests
     """
-    if where_params is None:
-      where_params = []
-
-    async with self._get_connection() as conn:
+    source, params = build_stats_source(start_utc, end_utc, timezone_offset)
+    async with self._read_connection() as conn:
       cursor = await conn.execute(f"""
         SELECT
-          {date_expr} as date,
+          substr(local_ts, 1, 10) as date,
           provider,
           model,
-          COUNT(*) as requests,
+          SUM(requests) as requests,
           SUM(cost) as cost,
-          SUM(total_tokens) as tokens
-        FROM requests
-        WHERE error IS NULL
-          AND {where_filter}
-        GROUP BY {date_expr}, provider, model
+          SUM(SUM(requests)) OVER day as day_requests,
+          SUM(SUM(cost)) OVER day as day_cost,
+          SUM(SUM(tokens)) OVER day as day_tokens
+        FROM ({source})
+        GROUP BY 1, 2, 3
+        WINDOW day AS (PARTITION BY substr(local_ts, 1, 10))
         ORDER BY date DESC
-      """, where_params)
+      """, params)
       rows = await cursor.fetchall()
 
-      # Group by date
-      daily_data = {}
-      for row in rows:
-        date, provider, model, requests, cost, tokens = row
-        if date not in daily_data:
-          daily_data[date] = {
+      # Rows arrive ordered by date, one or more per date
+      daily_list: list[dict] = []
+      for date, provider, model, requests, cost, day_requests, day_cost, day_tokens in rows:
+        if not daily_list or daily_list[-1]['date'] != date:
+          daily_list.append({
             'date': date,
-            'requests': 0,
-            'cost': 0.0,
-            'total_tokens': 0,
+            'requests': day_requests,
+            'cost': round(day_cost or 0.0, 4),
+            'total_tokens': day_tokens or 0,
             'by_model': []
-          }
-        daily_data[date]['requests'] += requests
-        daily_data[date]['cost'] += cost or 0.0
-        daily_data[date]['total_tokens'] += tokens or 0
-        daily_data[date]['by_model'].append({
+          })
+        daily_list[-1]['by_model'].append({
           'provider': provider,
           'model': model,
           'requests': requests,
           'cost': round(cost or 0, 4)
         })
 
-      # Convert to sorted list
-      daily_list = sorted(daily_data.values(), key=lambda x: x['date'], reverse=True)
-
-      # Round costs
-      for day in daily_list:
-        day['cost'] = round(day['cost'], 4)
-
       # Calculate totals
       total_cost = sum(day['cost'] for day in daily_list)
       total_requests = sum(day['requests'] for day in daily_list)
@@ -415,69 +887,60 @@ class Database:
         'total_requests': total_requests
       }
 
-  async def get_hourly_stats(self, where_filter: str, hour_expr: str, where_params: Optional[list] = None):
+  async def get_hourly_stats(self, start_utc: str, end_utc: str,
+                             timezone_offset: Optional[int] = None):
     """Get hourly aggregated statistics for a single day.
 
+    Sums stats_bucket hours where it can (see build_stats_source()). All
+    24 hours are allocated up front and the grouped rows are added to
+    their hour by index, so hours without traffic stay zero.
+
     Args:
-      where_filter: SQL WHERE clause (without WHERE keyword)
-      hour_expr: SQL expression for grouping by hour with timezone
-      where_params: Parameters for where_filter placeholders
+      start_utc: Inclusive UTC timestamp for range start
+      end_utc: Exclusive UTC timestamp for range end
+      timezone_offset: Minutes from UTC for grouping by local hour, or None for UTC
 
     Returns:
-      Dict with hourly array, total_cost, total_requests
+      Dict with hourly array (always 24 entries), total_cost, total_requests
     """
-    if where_params is None:
-      where_params = []
-
-    async with self._get_connection() as conn:
+    source, params = build_stats_source(start_utc, end_utc, timezone_offset)
+    async with self._read_connection() as conn:
       cursor = await conn.execute(f"""
         SELECT
-          {hour_expr} as hour,
+          CAST(substr(local_ts, 12, 2) AS INTEGER) as hour,
           provider,
           model,
-          COUNT(*) as requests,
+          SUM(requests) as requests,
           SUM(cost) as cost,
-          SUM(total_tokens) as tokens
-        FROM requests
-        WHERE error IS NULL
-          AND {where_filter}
-        GROUP BY {hour_expr}, provider, model
-        ORDER BY hour ASC
-      """, where_params)
+          SUM(tokens) as tokens
+        FROM ({source})
+        GROUP BY 1, 2, 3
+      """, params)
       rows = await cursor.fetchall()
 
-      # Group by hour
-      hourly_data = {}
-      for row in rows:
-        hour, provider, model, requests, cost, tokens = row
-        if hour not in hourly_data:
-          hourly_data[hour] = {
-            'hour': hour,
-            'requests': 0,
-            'cost': 0.0,
-            'total_tokens': 0,
-            'by_model': []
-          }
-        hourly_data[hour]['requests'] += requests
-        hourly_data[hour]['cost'] += cost or 0.0
-        hourly_data[hour]['total_tokens'] += tokens or 0
-        hourly_data[hour]['by_model'].append({
+      hourly_list: list[dict] = [
+        {'hour': hour, 'requests': 0, 'cost': 0.0, 'total_tokens': 0, 'by_model': []}
+        for hour in range(24)
+      ]
+      for hour, provider, model, requests, cost, tokens in rows:
+        entry = hourly_list[hour]
+        entry['requests'] += requests
+        entry['cost'] += cost or 0.0
+        entry['total_tokens'] += tokens or 0
+        entry['by_model'].append({
           'provider': provider,
           'model': model,
           'requests': requests,
           'cost': round(cost or 0, 4)
         })
 
-      # Convert to sorted list
-      hourly_list = sorted(hourly_data.values(), key=lambda x: x['hour'])
-
       # Round costs
-      for hour in hourly_list:
-        hour['cost'] = round(hour['cost'], 4)
+      for entry in hourly_list:
+        entry['cost'] = round(entry['cost'], 4)
 
       # Calculate totals
-      total_cost = sum(hour['cost'] for hour in hourly_list)
-      total_requests = sum(hour['requests'] for hour in hourly_list)
+      total_cost = sum(entry['cost'] for entry in hourly_list)
+      total_requests = sum(entry['requests'] for entry in hourly_list)
 
       return {
         'hourly': hourly_list,
@@ -493,7 +956,8 @@ class Database:
     """
     async with self._get_connection() as conn:
       cursor = await conn.execute("DELETE FROM requests WHERE error IS NOT NULL")
-      return cursor.rowcount
+    self.generation += 1
+    return cursor.rowcount
 
   async def get_date_range(self):
     """Get the actual date range of data in the database.
@@ -501,7 +965,7 @@ class Database:
     Returns:
       Dict with start_date and end_date (None values if no data)
     """
-    async with self._get_connection() as conn:
+    async with self._read_connection() as conn:
       cursor = await conn.execute("""
         SELECT MIN(DATE(timestamp)), MAX(DATE(timestamp))
         FROM requests
@@ -525,7 +989,7 @@ class Database:
     Returns:
       Dict with providers and models arrays, sorted by usage count descending
     """
-    async with self._get_connection() as conn:
+    async with self._read_connection() as conn:
       # Get providers with counts
       cursor = await conn.execute("""
         SELECT provider, COUNT(*) as count
@@ -2,7 +2,7 @@
 
 import json
 import re
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Type
 from litellm.exceptions import (
     RateLimitError,
     InternalServerError,
@@ -30,6 +30,9 @@ ERROR_MAP = {
     APIConnectionError: (502, "connection_error", "connection_error"),
 }
 
+# The mapped exception types, for use in except clauses
+LLM_ERRORS: Tuple[Type[Exception], ...] = tuple(ERROR_MAP)
+
 
 def get_error_details(exception: Exception) -> Tuple[int, str, str]:
   """Get HTTP status, error type, and error code for an exception.
@@ -40,6 +43,12 @@ def get_error_details(exception: Exception) -> Tuple[int, str, str]:
   Returns:
     Tuple of (status_code, error_type, error_code)
   """
+  # Most errors are exactly one of the mapped types; subclasses (e.g.
+  # ContextWindowExceededError) fall back to the isinstance scan
+  details = ERROR_MAP.get(type(exception))
+  if details is not None:
+    return details
+
   for exc_type, (code, etype, ecode) in ERROR_MAP.items():
     if isinstance(exception, exc_type):
       return code, etype, ecode
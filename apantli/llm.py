@@ -1,6 +1,11 @@
 """LLM provider inference and utilities."""
 
+from functools import lru_cache
 
+
+# Model strings are bounded by the configured models, so results are memoized
+# to keep the per-request lookup to a dict hit
+@lru_cache(maxsize=256)
 def infer_provider_from_model(model_name: str) -> str:
   """Infer provider from model name when not explicitly prefixed."""
   if not model_name:
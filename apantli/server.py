@@ -6,44 +6,52 @@ Compatible with OpenAI API format, uses LiteLLM SDK for provider routing.
 
 import os
 import socket
-import json
 import time
 import argparse
+import asyncio
+import gzip
+import hashlib
+import importlib.util
 import logging
-from datetime import datetime, timedelta
-from typing import Optional
-from contextlib import asynccontextmanager
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Optional
+from contextlib import aclosing, asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, Request, HTTPException, BackgroundTasks
 from starlette.background import BackgroundTask
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.templating import Jinja2Templates
+from pydantic import ValidationError
 from fastapi.staticfiles import StaticFiles
 import litellm
-from litellm import completion, model_cost
+from litellm import acompletion, model_cost
 from litellm.exceptions import (
     RateLimitError,
     InternalServerError,
     ServiceUnavailableError,
     APIConnectionError,
-    AuthenticationError,
     Timeout,
-    PermissionDeniedError,
-    NotFoundError,
     BadRequestError,
 )
+import orjson
 import uvicorn
 from dotenv import load_dotenv
 
 # Import from local modules
 from apantli.__version__ import __version__
-from apantli.config import LOG_INDENT, Config
+from apantli.cache import ResponseCache
+from apantli.config import LOG_INDENT, Config, ConfigError, ModelConfig
 from apantli.database import Database, RequestFilter
-from apantli.errors import build_error_response, get_error_details, extract_error_message
+from apantli.errors import LLM_ERRORS, build_error_response, get_error_details, extract_error_message
 from apantli.llm import infer_provider_from_model
-from apantli.utils import convert_local_date_to_utc_range, build_time_filter, build_date_expr, build_hour_expr
+from apantli.utils import (
+    build_utc_range, build_time_filter, build_time_range, default_date_range
+)
 
 # Load environment variables
 load_dotenv()
@@ -56,6 +64,18 @@ STATIC_DIR = PACKAGE_DIR / "static"
 
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
 
+# Prevent browser caching of the HTML pages to avoid stale UI bugs
+NO_CACHE_HEADERS = {
+    "Cache-Control": "no-cache, no-store, must-revalidate",
+    "Pragma": "no-cache",
+    "Expires": "0"
+}
+
+
+def render_page(name: str, **context) -> bytes:
+    """Render an HTML template once so handlers can serve the bytes as-is."""
+    return templates.get_template(name).render(**context).encode()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -65,20 +85,33 @@ async def lifespan(app: FastAPI):
     db_path = getattr(app.state, 'db_path', 'requests.db')
     app.state.timeout = getattr(app.state, 'timeout', 120)
     app.state.retries = getattr(app.state, 'retries', 3)
+    cache_size = getattr(app.state, 'cache_size', 1024)
+    app.state.response_cache = ResponseCache(maxsize=cache_size) if cache_size > 0 else None
+
+    # The dashboard has no per-request content, so render it once
+    app.state.dashboard_html = render_page("dashboard.html")
+    # Compressed once at the highest level instead of by GZipMiddleware
+    # on every load
+    app.state.dashboard_gzip = gzip.compress(app.state.dashboard_html, compresslevel=9)
 
     # Load configuration
-    config = Config(config_path)
-    app.state.config = config
-    app.state.model_map = config.get_model_map({
-        'timeout': app.state.timeout,
-        'num_retries': app.state.retries
-    })
+    app.state.config = Config(config_path)
+    app.state.config_lock = asyncio.Lock()
+    refresh_model_state(app.state)
+    refresh_provider_state(app.state)
 
     # Initialize database
     db = Database(db_path)
     await db.init()
+    await db.connect()
     app.state.db = db
+    app.state.stats_cache = {}
+
+    # Batch request logging off the response path; flushed on shutdown
+    db.start_writer()
     yield
+    await db.stop_writer()
+    await db.close()
 
 
 app = FastAPI(
@@ -87,34 +120,45 @@ app = FastAPI(
     version=__version__,
     docs_url="/docs",
     redoc_url="/redoc",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Mount static files directory
 app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 
 
+# Dashboard GET requests suppressed from access logs, as one alternation
+# so each record costs a single regex scan
+NOISY_REQUEST_RE = re.compile(
+    r"GET (?:"
+    r"/ "  # Dashboard homepage
+    r"|/stats\?"
+    r"|/stats/daily\?"
+    r"|/stats/date-range"
+    r"|/static/"
+    r"|/requests"  # Requests endpoint
+    r"|/models"  # Models endpoint
+    r"|/errors"  # Errors endpoint
+    r"|/health"  # Health check
+    r")"
+)
+
+
 # Configure logging filter for dashboard endpoints (at module level for --reload compatibility)
 class DashboardFilter(logging.Filter):
     """Filter out noisy dashboard GET requests from access logs."""
     def filter(self, record):
-        # Suppress logs for dashboard polling endpoints
-        # Check the formatted message since uvicorn log records vary
+        # uvicorn access records carry (client_addr, method, full_path,
+        # http_version, status_code) as args; match on those directly to
+        # avoid formatting the message
+        args = record.args
+        if isinstance(args, tuple) and len(args) == 5:
+            return NOISY_REQUEST_RE.match(f"{args[1]} {args[2]} ") is None
+
+        # Other uvicorn log records vary, so check the formatted message
         message = record.getMessage() if hasattr(record, 'getMessage') else str(record.msg)
-
-        # Filter out all dashboard-related GET requests
-        noisy_patterns = [
-            'GET / ',  # Dashboard homepage
-            'GET /stats?',
-            'GET /stats/daily?',
-            'GET /stats/date-range',
-            'GET /static/',
-            'GET /requests',  # Requests endpoint
-            'GET /models',  # Models endpoint
-            'GET /errors',  # Errors endpoint
-            'GET /health',  # Health check
-        ]
-        return not any(pattern in message for pattern in noisy_patterns)
+        return NOISY_REQUEST_RE.search(message) is None
 
 
 # Apply filter to access logger at module level
@@ -129,6 +173,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON and HTML responses, chiefly /requests pages with
+# full request/response bodies. Starlette leaves text/event-stream alone,
+# so streamed completions are not buffered.
+app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=6)
+
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
@@ -138,74 +187,232 @@ async def http_exception_handler(request: Request, exc: HTTPException):
         exc.detail if isinstance(exc.detail, str) else str(exc.detail),
         f"http_{exc.status_code}"
     )
-    return JSONResponse(content=error_response, status_code=exc.status_code)
+    return ORJSONResponse(content=error_response, status_code=exc.status_code)
 
 
-def resolve_model_config(model: str, request_data: dict, model_map: dict,
-                        timeout: int, retries: int, config=None) -> dict:
-    """Resolve model configuration and merge with request parameters.
+# model_map keys that are Apantli metadata rather than LiteLLM parameters
+EXCLUDED_KEYS = ('model', 'api_key', 'enabled', 'input_cost_per_million', 'output_cost_per_million')
+
+# Template keys that always replace the client's value
+TEMPLATE_OVERRIDES = ('model', 'api_key')
+
+# Model fields that PATCH /api/models/{model_name} may change
+UPDATABLE_MODEL_FIELDS = ('enabled', 'temperature', 'max_tokens', 'timeout', 'num_retries')
+
+# Config edits within this many seconds of the last backup share that backup
+BACKUP_MIN_INTERVAL = 60
+
+# Seconds /stats/date-range and /stats/filters results may be reused
+STATS_CACHE_TTL = 5
+
+
+def cache_json(payload) -> tuple[bytes, str]:
+    """Serialize a response payload once and derive an ETag from it.
+
+    Returns:
+        (body, etag) tuple for cached_json_response()
+    """
+    body = orjson.dumps(payload)
+    return body, f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+def cached_json_response(request: Request, cached: tuple[bytes, str]) -> Response:
+    """Serve a cache_json() result, answering 304 when the client's copy is current."""
+    body, etag = cached
+    headers = {'ETag': etag}
+    if request.headers.get('if-none-match') == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type='application/json', headers=headers)
+
+
+def build_model_templates(model_map: dict, timeout: int, retries: int) -> dict:
+    """Pre-resolve the per-model defaults merged into every request.
+
+    Everything resolve_model_config() needs is fixed once the config is
+    loaded, so it is computed here instead of on each request: the LiteLLM
+    model name, the API key (already resolved by Config.get_model_map()),
+    the passthrough litellm_params, and the global timeout/retry fallbacks.
 
     Args:
-        model: Model name from request
-        request_data: Request data dict (will be modified)
-        model_map: Model configuration map from app.state
+        model_map: Model configuration map from Config.get_model_map()
         timeout: Default timeout from app.state
         retries: Default retries from app.state
-        config: Optional Config instance to check enabled status
 
     Returns:
-        Updated request_data dict
+        Dict mapping model names to request template dicts
+    """
+    templates = {}
+    for model_name, model_config in model_map.items():
+        template = {'model': model_config['model']}
+
+        # An empty key (unset environment variable) is left out so the
+        # request fails with the provider's authentication error
+        api_key = model_config.get('api_key')
+        if api_key:
+            template['api_key'] = api_key
+
+        for key, value in model_config.items():
+            if key not in EXCLUDED_KEYS and value is not None:
+                template[key] = value
+
+        # Apply global defaults if not specified
+        if template.get('timeout') is None:
+            template['timeout'] = timeout
+        if template.get('num_retries') is None:
+            template['num_retries'] = retries
+
+        templates[model_name] = template
+
+    return templates
+
+
+def build_model_providers(model_map: dict) -> dict:
+    """Infer the logged provider for every configured model.
+
+    Kept apart from the request templates, which are passed to LiteLLM
+    as keyword arguments.
+
+    Args:
+        model_map: Model configuration map from Config.get_model_map()
+
+    Returns:
+        Dict mapping model names to provider names
+    """
+    return {
+        model_name: infer_provider_from_model(model_config['model'])
+        for model_name, model_config in model_map.items()
+    }
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Everything derived from one version of the configuration.
+
+    Handlers read app.state.snapshot once and use that object throughout,
+    so a request that awaits a provider keeps a consistent model map,
+    templates and enabled set even if the config changes meanwhile.
+    """
+    models: dict
+    model_map: dict
+    model_templates: dict
+    model_providers: dict
+    enabled_models: frozenset
+    available_models: str
+    models_response: tuple[bytes, str]
+    obsidian_export: dict
+    obsidian_etag: str
+    compare_html: bytes
+    pricing_index: dict
+
+
+def refresh_model_state(state, changed_model: Optional[str] = None) -> None:
+    """Build a ConfigSnapshot from state.config and publish it as state.snapshot.
+
+    Called at startup and after every config change. The snapshot is built
+    completely before the single attribute assignment that replaces the old
+    one, so readers never see a partially updated configuration.
+
+    Args:
+        state: app.state
+        changed_model: Name of the only model that changed (not added or
+            removed); the other models' entries are reused from the current
+            snapshot instead of being rebuilt
+    """
+    config = state.config
+    defaults = {'timeout': state.timeout, 'num_retries': state.retries}
+    previous = getattr(state, 'snapshot', None)
+
+    if changed_model is not None and previous is not None and previous.model_map.keys() == config.models.keys():
+        entry = {changed_model: config.get_model_entry(changed_model, defaults)}
+        model_map = {**previous.model_map, **entry}
+        model_templates = {
+            **previous.model_templates,
+            **build_model_templates(entry, state.timeout, state.retries)
+        }
+        pricing_index = {**previous.pricing_index, **build_pricing_index(entry)}
+        model_providers = {**previous.model_providers, **build_model_providers(entry)}
+        # Same model names, so the compare page and model list are unchanged
+        compare_html = previous.compare_html
+        available_models = previous.available_models
+    else:
+        model_map = config.get_model_map(defaults)
+        model_templates = build_model_templates(model_map, state.timeout, state.retries)
+        pricing_index = build_pricing_index(model_map)
+        model_providers = build_model_providers(model_map)
+        compare_html = render_page("compare.html", models=list(model_map.keys()))
+        available_models = format_available_models(model_map)
+
+    enabled_models = config.get_enabled_models()
+    obsidian_export = build_obsidian_export(pricing_index, enabled_models)
+    state.snapshot = ConfigSnapshot(
+        models=config.models,
+        model_map=model_map,
+        model_templates=model_templates,
+        model_providers=model_providers,
+        enabled_models=enabled_models,
+        available_models=available_models,
+        models_response=cache_json(build_models_payload(model_map, enabled_models, pricing_index)),
+        obsidian_export=obsidian_export,
+        obsidian_etag=cache_json(obsidian_export)[1],
+        compare_html=compare_html,
+        pricing_index=pricing_index
+    )
+
+
+def format_available_models(model_names) -> str:
+    """Format the sorted model list appended to unknown-model errors.
+
+    Built once per config version so a burst of bad requests does not
+    sort and join the model names for every error.
+    """
+    if not model_names:
+        return ""
+    return f" Available models: {', '.join(sorted(model_names))}"
+
+
+def resolve_model_config(model: str, request_data: dict, model_templates: dict,
+                         enabled_models: Optional[frozenset] = None,
+                         available_models: Optional[str] = None) -> dict:
+    """Resolve model configuration and merge with request parameters.
+
+    Args:
+        model: Model name from request
+        request_data: Request data dict from the client (not modified)
+        model_templates: Per-model templates from build_model_templates()
+        enabled_models: Optional set of enabled model names; None skips the check
+        available_models: Preformatted model list from format_available_models();
+            None formats it from model_templates
+
+    Returns:
+        New request dict with template defaults applied and null values dropped
 
     Raises:
         HTTPException: If model not found in configuration or disabled
     """
-    if model not in model_map:
-        available_models = sorted(model_map.keys())
-        error_msg = f"Model '{model}' not found in configuration."
-        if available_models:
-            error_msg += f" Available models: {', '.join(available_models)}"
+    if model not in model_templates:
+        if available_models is None:
+            available_models = format_available_models(model_templates)
+        error_msg = f"Model '{model}' not found in configuration.{available_models}"
         raise HTTPException(status_code=404, detail=error_msg)
 
     # Check if model is enabled
-    if config and model in config.models:
-        model_config_obj = config.models[model]
-        if not model_config_obj.enabled:
-            raise HTTPException(
-                status_code=403,
-                detail=f"Model '{model}' is disabled. Enable it in the dashboard at /."
-            )
+    if enabled_models is not None and model not in enabled_models:
+        raise HTTPException(
+            status_code=403,
+            detail=f"Model '{model}' is disabled. Enable it in the dashboard at /."
+        )
 
-    model_config = model_map[model]
-
-    # Replace model with LiteLLM format
-    request_data['model'] = model_config['model']
-
-    # Handle api_key from config (resolve environment variable)
-    api_key = model_config.get('api_key', '')
-    if api_key.startswith('os.environ/'):
-        env_var = api_key.split('/', 1)[1]
-        api_key = os.environ.get(env_var, '')
-    if api_key:
-        request_data['api_key'] = api_key
-
-    # Pass through all other litellm_params (timeout, num_retries, temperature, etc.)
-    # Config provides defaults; client values (except null) always win
-    # Exclude metadata fields that shouldn't be sent to LiteLLM
-    EXCLUDED_KEYS = ('model', 'api_key', 'enabled', 'input_cost_per_million', 'output_cost_per_million')
-    for key, value in model_config.items():
-        if key not in EXCLUDED_KEYS:
-            # Use config value only if client didn't provide, or provided None/null
-            # This allows: config defaults, client override, null → use config
-            if key not in request_data or request_data.get(key) is None:
-                request_data[key] = value
-
-    # Apply global defaults if not specified
-    if 'timeout' not in request_data:
-        request_data['timeout'] = timeout
-    if 'num_retries' not in request_data:
-        request_data['num_retries'] = retries
+    # Config provides defaults (timeout, num_retries, temperature, etc.)
+    # and client values (except null) always win; model and api_key always
+    # come from config. Templates never hold None, so the merged dict is
+    # free of null values without a separate filtering pass
+    template = model_templates[model]
+    merged = {**template, **{k: v for k, v in request_data.items() if v is not None}}
+    for key in TEMPLATE_OVERRIDES:
+        if key in template:
+            merged[key] = template[key]
 
-    return request_data
+    return merged
 
 
 # Models that reject temperature + top_p being specified together
@@ -214,6 +421,7 @@ ANTHROPIC_STRICT_MODELS = [
     'claude-sonnet-4-5-20250929',
     'claude-opus-4',  # Prefix match for all Opus 4.x versions
 ]
+ANTHROPIC_STRICT_MODEL_RE = re.compile('|'.join(map(re.escape, ANTHROPIC_STRICT_MODELS)))
 
 
 def filter_parameters_for_model(request_data: dict) -> dict:
@@ -224,18 +432,15 @@ def filter_parameters_for_model(request_data: dict) -> dict:
     incompatible parameters before sending to LiteLLM.
 
     Args:
-        request_data: Request data dict with 'model' and parameters
+        request_data: Request data dict with 'model' and parameters (modified in place)
 
     Returns:
-        Filtered request_data dict
+        The same request_data dict, filtered
     """
     litellm_model = request_data.get('model', '')
 
     # Check if this is an Anthropic model with strict parameter constraints
-    is_strict_model = any(
-        strict_model in litellm_model
-        for strict_model in ANTHROPIC_STRICT_MODELS
-    )
+    is_strict_model = ANTHROPIC_STRICT_MODEL_RE.search(litellm_model) is not None
 
     if is_strict_model:
         # If both temperature and top_p are present, remove top_p
@@ -247,12 +452,54 @@ def filter_parameters_for_model(request_data: dict) -> dict:
             removed_value = request_data.pop('top_p')
             logging.info(f"Removed top_p={removed_value} for {litellm_model} (model constraint: cannot specify both temperature and top_p)")
 
-    # Remove None/null values from request_data to avoid sending them to provider
-    request_data = {k: v for k, v in request_data.items() if v is not None}
-
     return request_data
 
 
+# Server-sent event framing, pre-encoded so the streaming loop yields bytes
+SSE_PREFIX = b"data: "
+SSE_SUFFIX = b"\n\n"
+SSE_DONE = b"data: [DONE]\n\n"
+
+# SSE comment sent when the provider has been silent this many seconds, so
+# proxies and clients with idle timeouts keep the connection open while a
+# model is thinking. EventSource and the OpenAI SDKs ignore comments.
+SSE_PING = b": ping\n\n"
+SSE_PING_INTERVAL = 15
+
+# Keep caches and reverse proxies (nginx buffers by default) from holding
+# back streamed chunks
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+async def iterate_with_pings(stream, interval: float):
+    """Iterate an async stream, yielding None whenever it is idle for interval seconds.
+
+    The pending read runs in its own task, so timing out to send a ping
+    does not cancel it.
+    """
+    iterator = aiter(stream)
+    pending = asyncio.ensure_future(anext(iterator))
+    try:
+        while True:
+            done, _ = await asyncio.wait((pending,), timeout=interval)
+            if not done:
+                yield None
+                continue
+            try:
+                chunk = pending.result()
+            except StopAsyncIteration:
+                return
+            pending = asyncio.ensure_future(anext(iterator))
+            yield chunk
+    finally:
+        pending.cancel()
+
+
+def elapsed_ms(start_ns: int) -> int:
+    """Milliseconds elapsed since a time.monotonic_ns() reading."""
+    return (time.monotonic_ns() - start_ns) // 1_000_000
+
+
 def calculate_cost(response) -> float:
     """Calculate cost for a completion response, returning 0.0 on error."""
     try:
@@ -266,28 +513,30 @@ async def execute_streaming_request(
     response,
     model: str,
     request_data: dict,
-    request_data_for_logging: dict,
-    start_time: float,
+    start_ns: int,
     db: Database,
-    request: Request
+    provider: Optional[str] = None
 ) -> StreamingResponse:
     """Execute and stream LiteLLM response with logging.
 
     Args:
-        response: LiteLLM streaming response
+        response: LiteLLM async streaming response
         model: Original model name from request
-        request_data: Request data dict
-        request_data_for_logging: Copy of request data for logging
-        start_time: Request start time
+        request_data: Request data dict, also logged (not modified)
+        start_ns: Request start from time.monotonic_ns()
         db: Database instance
-        request: FastAPI Request object for disconnect detection
+        provider: Provider from the config snapshot; inferred from
+            request_data['model'] when not given
 
     Returns:
         StreamingResponse with SSE format
+
+    Client disconnects are not polled per chunk. StreamingResponse already
+    listens for http.disconnect and cancels the generator, which is logged
+    here and then re-raised.
     """
-    # Extract provider before creating generator (from remapped litellm model name)
-    litellm_model = request_data.get('model', '')
-    provider = infer_provider_from_model(litellm_model)
+    if provider is None:
+        provider = infer_provider_from_model(request_data.get('model', ''))
 
     # Collect chunks for logging
     full_response = {
@@ -296,38 +545,72 @@ async def execute_streaming_request(
         'choices': [{'message': {'role': 'assistant', 'content': ''}, 'finish_reason': None}],
         'usage': {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0}
     }
+    # Content deltas are joined once at logging time; repeated string
+    # concatenation is quadratic in the length of the reply
+    content_parts: list[str] = []
     socket_error_logged = False
 
+    def accumulate_chunk(chunk) -> None:
+        """Record content, finish reason, ID, and usage from a LiteLLM chunk."""
+        choices = getattr(chunk, 'choices', None)
+        if choices:
+            choice = choices[0]
+            content = getattr(getattr(choice, 'delta', None), 'content', None)
+            if content is not None:
+                content_parts.append(content)
+            full_response['choices'][0]['finish_reason'] = getattr(choice, 'finish_reason', None)
+
+        chunk_id = getattr(chunk, 'id', None)
+        if chunk_id:
+            full_response['id'] = chunk_id
+        usage = getattr(chunk, 'usage', None)
+        if usage is not None:
+            full_response['usage'] = usage.model_dump() if hasattr(usage, 'model_dump') else dict(usage)
+
     async def generate():
         nonlocal full_response, socket_error_logged
         stream_error = None
 
         try:
-            for chunk in response:
-                # Check if client has disconnected before processing
-                if await request.is_disconnected():
-                    if not socket_error_logged:
-                        logging.info("Client disconnected during streaming")
-                        socket_error_logged = True
-                    return
-
-                chunk_dict = chunk.model_dump() if hasattr(chunk, 'model_dump') else dict(chunk)
-
-                # Accumulate content
-                if 'choices' in chunk_dict and len(chunk_dict['choices']) > 0:
-                    delta = chunk_dict['choices'][0].get('delta', {})
-                    if 'content' in delta and delta['content'] is not None:
-                        full_response['choices'][0]['message']['content'] += delta['content']
-                    if 'finish_reason' in chunk_dict['choices'][0]:
-                        full_response['choices'][0]['finish_reason'] = chunk_dict['choices'][0]['finish_reason']
-
-                # Capture ID and usage
-                if 'id' in chunk_dict and chunk_dict['id']:
-                    full_response['id'] = chunk_dict['id']
-                if 'usage' in chunk_dict:
-                    full_response['usage'] = chunk_dict['usage']
-
-                yield f"data: {json.dumps(chunk_dict)}\n\n"
+            # aclosing() stops the pending provider read as soon as this
+            # generator is closed, not whenever it is garbage collected
+            async with aclosing(iterate_with_pings(response, SSE_PING_INTERVAL)) as chunks:
+                async for chunk in chunks:
+                    if chunk is None:
+                        yield SSE_PING
+                        continue
+
+                    if hasattr(chunk, 'model_dump_json'):
+                        # Read the logged fields straight off the pydantic chunk and
+                        # let pydantic serialize it, skipping the dict round trip
+                        accumulate_chunk(chunk)
+                        yield SSE_PREFIX + chunk.model_dump_json().encode() + SSE_SUFFIX
+                        continue
+
+                    chunk_dict = chunk.model_dump() if hasattr(chunk, 'model_dump') else dict(chunk)
+
+                    # Accumulate content
+                    if 'choices' in chunk_dict and len(chunk_dict['choices']) > 0:
+                        delta = chunk_dict['choices'][0].get('delta', {})
+                        if 'content' in delta and delta['content'] is not None:
+                            content_parts.append(delta['content'])
+                        if 'finish_reason' in chunk_dict['choices'][0]:
+                            full_response['choices'][0]['finish_reason'] = chunk_dict['choices'][0]['finish_reason']
+
+                    # Capture ID and usage
+                    if 'id' in chunk_dict and chunk_dict['id']:
+                        full_response['id'] = chunk_dict['id']
+                    if 'usage' in chunk_dict:
+                        full_response['usage'] = chunk_dict['usage']
+
+                    yield SSE_PREFIX + orjson.dumps(chunk_dict) + SSE_SUFFIX
+
+        except (asyncio.CancelledError, GeneratorExit):
+            # Starlette cancelled or closed the stream after a client disconnect
+            if not socket_error_logged:
+                logging.info("Client disconnected during streaming")
+                socket_error_logged = True
+            raise
 
         except (BrokenPipeError, ConnectionError, ConnectionResetError) as exc:
             # Client disconnected - stop streaming
@@ -342,9 +625,7 @@ async def execute_streaming_request(
             stream_error = f"{type(exc).__name__}: {clean_msg}"
             full_response['_stream_error'] = stream_error  # Store for background logging
             error_event = build_error_response("stream_error", clean_msg, type(exc).__name__.lower())
-            # Only try to send error if client is still connected
-            if not await request.is_disconnected():
-                yield f"data: {json.dumps(error_event)}\n\n"
+            yield SSE_PREFIX + orjson.dumps(error_event) + SSE_SUFFIX
 
         except Exception as exc:
             # Unexpected error during streaming
@@ -352,22 +633,19 @@ async def execute_streaming_request(
             stream_error = f"UnexpectedStreamError: {clean_msg}"
             full_response['_stream_error'] = stream_error  # Store for background logging
             error_event = build_error_response("stream_error", clean_msg, "internal_error")
-            # Only try to send error if client is still connected
-            if not await request.is_disconnected():
-                yield f"data: {json.dumps(error_event)}\n\n"
+            yield SSE_PREFIX + orjson.dumps(error_event) + SSE_SUFFIX
 
-        finally:
-            # Send [DONE] only if client is still connected
-            if not await request.is_disconnected():
-                yield "data: [DONE]\n\n"
+        # Reached after normal completion and after a provider error event
+        yield SSE_DONE
 
     # Background task to log after streaming completes
     async def log_streaming_request():
         try:
-            duration_ms = int((time.time() - start_time) * 1000)
+            duration_ms = elapsed_ms(start_ns)
             stream_error = full_response.get('_stream_error')  # Will be set if there was an error
+            full_response['choices'][0]['message']['content'] = ''.join(content_parts)
 
-            await db.log_request(model, provider, full_response, duration_ms, request_data_for_logging, error=stream_error)
+            await db.log_request(model, provider, full_response, duration_ms, request_data, error=stream_error)
 
             # Log completion
             if stream_error:
@@ -382,69 +660,121 @@ async def execute_streaming_request(
         except Exception as exc:
             logging.error(f"Error logging streaming request to database: {exc}")
 
-    return StreamingResponse(generate(), media_type="text/event-stream", background=BackgroundTask(log_streaming_request))
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+        background=BackgroundTask(log_streaming_request)
+    )
 
 
 async def execute_request(
     response,
     model: str,
     request_data: dict,
-    request_data_for_logging: dict,
-    start_time: float,
-    db: Database
-) -> JSONResponse:
+    start_ns: int,
+    db: Database,
+    cache: Optional[ResponseCache] = None,
+    cache_key: Optional[bytes] = None,
+    provider: Optional[str] = None
+) -> Response:
     """Execute non-streaming LiteLLM request with logging.
 
     Args:
         response: LiteLLM response object
         model: Original model name from request
-        request_data: Request data dict
-        request_data_for_logging: Copy of request data for logging
-        start_time: Request start time
+        request_data: Request data dict, also logged (not modified)
+        start_ns: Request start from time.monotonic_ns()
         db: Database instance
+        cache: Response cache to store the result in, if cache_key is set
+        cache_key: Key from ResponseCache.make_key()
+        provider: Provider from the config snapshot; inferred from
+            request_data['model'] when not given
 
     Returns:
-        JSONResponse with completion data
+        Response with the completion JSON
     """
-    # Convert to dict for logging and response
-    if hasattr(response, 'model_dump'):
-        response_dict = response.model_dump()
-    elif hasattr(response, 'dict'):
-        response_dict = response.dict()
+    if hasattr(response, 'model_dump_json'):
+        # Serialize once with pydantic-core for the wire; the log writer
+        # turns the response object into a dict later, off the response path
+        body = response.model_dump_json().encode()
+        logged_response = response
+        usage = response.usage.model_dump() if getattr(response, 'usage', None) is not None else {}
     else:
-        response_dict = json.loads(response.json())
+        logged_response = response.dict() if hasattr(response, 'dict') else orjson.loads(response.json())
+        body = orjson.dumps(logged_response)
+        usage = logged_response.get('usage') or {}
 
-    # Extract provider from request_data (which has the remapped litellm model name)
-    litellm_model = request_data.get('model', '')
-    provider = infer_provider_from_model(litellm_model)
+    if provider is None:
+        provider = infer_provider_from_model(request_data.get('model', ''))
 
     # Fallback: try response metadata if still unknown
     if provider == 'unknown' and hasattr(response, '_hidden_params'):
         provider = response._hidden_params.get('custom_llm_provider', 'unknown')
 
     # Calculate duration
-    duration_ms = int((time.time() - start_time) * 1000)
+    duration_ms = elapsed_ms(start_ns)
 
-    # Log to database
-    await db.log_request(model, provider, response_dict, duration_ms, request_data_for_logging)
+    if cache is not None and cache_key is not None:
+        cache.put(cache_key, body)
+
+    # Cost is needed for the console line anyway, so hand it to the logger
+    # instead of having the writer calculate it again
+    cost = calculate_cost(response)
+    await db.log_request(model, provider, logged_response, duration_ms, request_data, cost=cost)
 
     # Log completion
-    usage = response_dict.get('usage', {})
     prompt_tokens = usage.get('prompt_tokens', 0)
     completion_tokens = usage.get('completion_tokens', 0)
     total_tokens = usage.get('total_tokens', 0)
-    cost = calculate_cost(response)
     print(f"{LOG_INDENT}✓ LLM Response: {model} ({provider}) | {duration_ms}ms | {prompt_tokens}→{completion_tokens} tokens ({total_tokens} total) | ${cost:.4f}")
 
-    return JSONResponse(content=response_dict)
+    return Response(content=body, media_type='application/json')
+
 
+async def serve_cached_response(
+    cached: bytes,
+    model: str,
+    request_data: dict,
+    start_ns: int,
+    db: Database,
+    provider: Optional[str] = None
+) -> ORJSONResponse:
+    """Return a response from the response cache, logged at zero cost.
+
+    Args:
+        cached: Response body stored by execute_request()
+        model: Original model name from request
+        request_data: Request data dict, also logged (not modified)
+        start_ns: Request start from time.monotonic_ns()
+        db: Database instance
+        provider: Provider from the config snapshot; inferred from
+            request_data['model'] when not given
 
-async def handle_llm_error(e: Exception, start_time: float, request_data: dict,
-                          request_data_for_logging: dict, db: Database) -> JSONResponse:
+    Returns:
+        ORJSONResponse with the cached completion, marked as cached
+    """
+    if provider is None:
+        provider = infer_provider_from_model(request_data.get('model', ''))
+    response_dict = orjson.loads(cached)
+    response_dict['cached'] = True
+    duration_ms = elapsed_ms(start_ns)
+
+    await db.log_request(model, provider, response_dict, duration_ms, request_data, cost=0.0)
+
+    usage = response_dict.get('usage') or {}
+    print(f"{LOG_INDENT}✓ LLM Response: {model} ({provider}) | {duration_ms}ms | {usage.get('total_tokens', 0)} tokens (cache hit) | $0.0000")
+
+    return ORJSONResponse(content=response_dict, headers={'X-Apantli-Cache': 'hit'})
+
+
+async def handle_llm_error(e: Exception, start_ns: int, request_data: dict,
+                           db: Database, provider: Optional[str] = None) -> ORJSONResponse:
     """Handle LLM API errors with consistent logging and response formatting."""
-    duration_ms = int((time.time() - start_time) * 1000)
+    duration_ms = elapsed_ms(start_ns)
     model_name = request_data.get('model', 'unknown')
-    provider = infer_provider_from_model(model_name)
+    if provider is None:
+        provider = infer_provider_from_model(model_name)
 
     # Get error details from error mapping
     status_code, error_type, error_code = get_error_details(e)
@@ -463,7 +793,7 @@ async def handle_llm_error(e: Exception, start_time: float, request_data: dict,
         provider,
         None,
         duration_ms,
-        request_data_for_logging,
+        request_data,
         error=f"{error_name}: {clean_error_msg}"
     )
 
@@ -472,7 +802,7 @@ async def handle_llm_error(e: Exception, start_time: float, request_data: dict,
 
     # Build and return error response with clean message
     error_response = build_error_response(error_type, clean_error_msg, error_code)
-    return JSONResponse(content=error_response, status_code=status_code)
+    return ORJSONResponse(content=error_response, status_code=status_code)
 
 
 @app.post("/v1/chat/completions")
@@ -480,31 +810,37 @@ async def handle_llm_error(e: Exception, start_time: float, request_data: dict,
 async def chat_completions(request: Request):
     """OpenAI-compatible chat completions endpoint."""
     db = request.app.state.db
-    start_time = time.time()
-    request_data = await request.json()
+    # Taken once, before any await, so the whole request sees one config
+    # version; config edits publish a new snapshot instead of locking readers
+    snapshot = request.app.state.snapshot
+    start_ns = time.monotonic_ns()
+    request_data = orjson.loads(await request.body())
+    provider = None
 
     try:
         # Validate model parameter
         model = request_data.get('model')
         if not model:
             error_response = build_error_response("invalid_request_error", "Model is required", "missing_model")
-            return JSONResponse(content=error_response, status_code=400)
+            return ORJSONResponse(content=error_response, status_code=400)
 
         # Resolve model configuration and merge with request
         request_data = resolve_model_config(
             model,
             request_data,
-            request.app.state.model_map,
-            request.app.state.timeout,
-            request.app.state.retries,
-            request.app.state.config
+            snapshot.model_templates,
+            snapshot.enabled_models,
+            snapshot.available_models
         )
+        # Resolved once from the config instead of re-parsing the LiteLLM
+        # model name in each handler below
+        provider = snapshot.model_providers[model]
 
         # Filter parameters based on model-specific constraints
         request_data = filter_parameters_for_model(request_data)
 
-        # Create logging copy with final request_data (includes API key and all params)
-        request_data_for_logging = request_data.copy()
+        # request_data is logged as-is after the call; nothing downstream
+        # mutates it, so no separate logging copy is kept
 
         # Log request start
         is_streaming = request_data.get('stream', False)
@@ -515,32 +851,42 @@ async def chat_completions(request: Request):
         if is_streaming:
             request_data['stream_options'] = {"include_usage": True}
 
-        # Call LiteLLM
-        response = completion(**request_data)
+        # Deterministic requests (temperature 0, not streaming) can be
+        # answered from the response cache unless the client opts out
+        cache = request.app.state.response_cache
+        cache_key = None
+        if cache is not None and request.headers.get('x-apantli-no-cache', '').lower() not in ('1', 'true', 'yes'):
+            cache_key = cache.make_key(request_data)
+            if cache_key is not None:
+                cached = cache.get(cache_key)
+                if cached is not None:
+                    return await serve_cached_response(cached, model, request_data, start_ns, db, provider)
+
+        # Call LiteLLM without blocking the event loop; streaming responses
+        # come back as an async iterator
+        response = await acompletion(**request_data)
 
         # Route to appropriate handler based on streaming mode
         if is_streaming:
-            return await execute_streaming_request(response, model, request_data, request_data_for_logging, start_time, db, request)
+            return await execute_streaming_request(response, model, request_data, start_ns, db, provider)
         else:
-            return await execute_request(response, model, request_data, request_data_for_logging, start_time, db)
+            return await execute_request(response, model, request_data, start_ns, db, cache, cache_key, provider)
 
     except HTTPException as exc:
         # Model not found - log and return error
-        duration_ms = int((time.time() - start_time) * 1000)
+        duration_ms = elapsed_ms(start_ns)
         await db.log_request(model, "unknown", None, duration_ms, request_data, error=f"UnknownModel: {exc.detail}")
         print(f"{LOG_INDENT}✗ LLM Response: {model} (unknown) | {duration_ms}ms | Error: UnknownModel")
         error_response = build_error_response("invalid_request_error", exc.detail, "model_not_found")
-        return JSONResponse(content=error_response, status_code=exc.status_code)
+        return ORJSONResponse(content=error_response, status_code=exc.status_code)
 
-    except (RateLimitError, AuthenticationError, PermissionDeniedError, NotFoundError,
-            Timeout, InternalServerError, ServiceUnavailableError, APIConnectionError,
-            BadRequestError) as exc:
-        return await handle_llm_error(exc, start_time, request_data, request_data_for_logging, db)
+    except LLM_ERRORS as exc:
+        return await handle_llm_error(exc, start_ns, request_data, db, provider)
 
     except Exception as exc:
         # Catch-all for unexpected errors
         logging.exception(f"Unexpected error in chat completions: {exc}")
-        return await handle_llm_error(exc, start_time, request_data, request_data_for_logging, db)
+        return await handle_llm_error(exc, start_ns, request_data, db, provider)
 
 
 @app.get("/health")
@@ -549,12 +895,21 @@ async def health():
     return {"status": "ok"}
 
 
-@app.get("/models")
-async def models(request: Request):
-    """List available models from config."""
-    model_list = []
-    for model_name, litellm_params in request.app.state.model_map.items():
-        # Try to get pricing info from LiteLLM
+def build_pricing_index(model_map: dict) -> dict:
+    """Resolve provider and per-million pricing for every configured model.
+
+    Built once per config change and shared by the /models and Obsidian
+    export payloads, so LiteLLM's cost map is consulted once per model.
+
+    Args:
+        model_map: Model configuration map from Config.get_model_map()
+
+    Returns:
+        Dict mapping model names to litellm_model, provider,
+        input_cost_per_million and output_cost_per_million
+    """
+    index = {}
+    for model_name, litellm_params in model_map.items():
         litellm_model = litellm_params['model']
         input_cost = None
         output_cost = None
@@ -563,13 +918,13 @@ async def models(request: Request):
             # Get per-token costs from LiteLLM's cost database
             # Try with full model name first, then without provider prefix
             model_data = None
-            if litellm_model in litellm.model_cost:
-                model_data = litellm.model_cost[litellm_model]
+            if litellm_model in model_cost:
+                model_data = model_cost[litellm_model]
             elif '/' in litellm_model:
                 # Try without provider prefix (e.g., "openai/gpt-4.1" -> "gpt-4.1")
                 model_without_provider = litellm_model.split('/', 1)[1]
-                if model_without_provider in litellm.model_cost:
-                    model_data = litellm.model_cost[model_without_provider]
+                if model_without_provider in model_cost:
+                    model_data = model_cost[model_without_provider]
 
             if model_data:
                 input_cost_per_token = model_data.get('input_cost_per_token', 0)
@@ -577,24 +932,49 @@ async def models(request: Request):
 
                 # Convert to per-million
                 if input_cost_per_token:
-                    input_cost = input_cost_per_token * 1000000
+                    input_cost = round(input_cost_per_token * 1_000_000, 2)
                 if output_cost_per_token:
-                    output_cost = output_cost_per_token * 1000000
-        except Exception as exc:
+                    output_cost = round(output_cost_per_token * 1_000_000, 2)
+        except Exception:
             pass
 
-        # Get enabled status from config
-        enabled = True
-        if hasattr(request.app.state, 'config') and model_name in request.app.state.config.models:
-            enabled = request.app.state.config.models[model_name].enabled
+        index[model_name] = {
+            'litellm_model': litellm_model,
+            'provider': litellm_model.split('/')[0] if '/' in litellm_model else 'unknown',
+            'input_cost_per_million': input_cost,
+            'output_cost_per_million': output_cost
+        }
+
+    return index
+
+
+def build_models_payload(model_map: dict, enabled_models: Optional[frozenset] = None,
+                         pricing_index: Optional[dict] = None) -> dict:
+    """Build the /models response from the model map and LiteLLM pricing.
+
+    Args:
+        model_map: Model configuration map from Config.get_model_map()
+        enabled_models: Optional set of enabled model names; None treats all as enabled
+        pricing_index: Optional result of build_pricing_index(); built if omitted
+
+    Returns:
+        Dict with models list
+    """
+    if pricing_index is None:
+        pricing_index = build_pricing_index(model_map)
+
+    model_list = []
+    for model_name, litellm_params in model_map.items():
+        pricing = pricing_index[model_name]
+        enabled = enabled_models is None or model_name in enabled_models
 
         model_info = {
             'name': model_name,
-            'litellm_model': litellm_params['model'],
-            'provider': litellm_params['model'].split('/')[0] if '/' in litellm_params['model'] else 'unknown',
+            'litellm_model': pricing['litellm_model'],
+            'provider': pricing['provider'],
             'enabled': enabled,
-            'input_cost_per_million': round(input_cost, 2) if input_cost else None,
-            'output_cost_per_million': round(output_cost, 2) if output_cost else None
+            'input_cost_per_million': pricing['input_cost_per_million'],
+            'output_cost_per_million': pricing['output_cost_per_million']
         }
 
         # Include predefined parameters if they exist in config
@@ -610,84 +990,60 @@ async def models(request: Request):
     return {'models': model_list}
 
 
-@app.get("/api/providers")
-async def get_providers():
-    """List all available LiteLLM providers with model counts.
+@app.get("/models")
+async def models(request: Request):
+    """List available models from config.
 
-    Returns a list of providers that can be used with Apantli, grouped by
-    popularity and showing how many models are available for each.
+    Served from bytes cached by refresh_model_state(), which runs at
+    startup and after every config change (including enable toggles).
     """
-    # Group models by provider
-    provider_counts: dict[str, int] = {}
-    for model_id in model_cost.keys():
-        # Extract provider from model ID (format: provider/model or just model)
-        if '/' in model_id:
-            provider = model_id.split('/')[0]
-        else:
-            # Direct model names (OpenAI format)
-            if model_id.startswith('gpt-') or model_id.startswith('text-') or model_id.startswith('davinci'):
-                provider = 'openai'
-            elif model_id.startswith('claude-'):
-                provider = 'anthropic'
-            elif model_id.startswith('gemini-'):
-                provider = 'google'
-            else:
-                provider = 'other'
+    return cached_json_response(request, request.app.state.snapshot.models_response)
 
-        provider_counts[provider] = provider_counts.get(provider, 0) + 1
 
-    # Define popular providers
-    popular_providers = {'openai', 'anthropic', 'google', 'gemini', 'azure', 'cohere', 'mistral'}
+# Providers shown first in the add-model flow
+POPULAR_PROVIDERS = {'openai', 'anthropic', 'google', 'gemini', 'azure', 'cohere', 'mistral'}
 
-    # Build provider list
-    providers = []
-    for provider_name, count in sorted(provider_counts.items(), key=lambda x: (-x[1], x[0])):
-        # Create display name
-        display_name = provider_name.replace('_', ' ').title()
-        if provider_name == 'google':
-            display_name = 'Google (Gemini)'
-        elif provider_name == 'openai':
-            display_name = 'OpenAI (GPT)'
-        elif provider_name == 'anthropic':
-            display_name = 'Anthropic (Claude)'
+# Models sorted first within a provider, in this order
+POPULAR_MODELS = ['gpt-4', 'gpt-3.5', 'claude-3', 'claude-haiku', 'claude-sonnet', 'claude-opus', 'gemini-pro', 'gemini-flash']
 
-        providers.append({
-            'name': provider_name,
-            'display_name': display_name,
-            'model_count': count,
-            'popular': provider_name in popular_providers
-        })
 
-    return {'providers': providers}
+def provider_for_model_id(model_id: str) -> Optional[str]:
+    """Get the provider for a LiteLLM model_cost key, or None if unrecognized."""
+    # Extract provider from model ID (format: provider/model or just model)
+    if '/' in model_id:
+        return model_id.split('/')[0]
 
+    # Direct model names (OpenAI format)
+    if model_id.startswith('gpt-') or model_id.startswith('text-') or model_id.startswith('davinci'):
+        return 'openai'
+    elif model_id.startswith('claude-'):
+        return 'anthropic'
+    elif model_id.startswith('gemini-'):
+        return 'google'
+    return None
 
-@app.get("/api/providers/{provider}/models")
-async def get_provider_models(provider: str):
-    """List all models for a specific provider with pricing information.
+
+def build_provider_indexes(cost_map: dict) -> tuple[dict, dict[str, dict]]:
+    """Build the /api/providers payloads from LiteLLM's cost database.
+
+    model_cost is fixed for the life of the process, so both payloads are
+    computed once at startup instead of scanning every entry per request.
 
     Args:
-        provider: Provider name (e.g., 'openai', 'anthropic', 'google')
+        cost_map: LiteLLM model_cost mapping
 
     Returns:
-        List of models with their pricing and context window information
+        (providers payload, dict mapping provider name to its models payload)
     """
-    # Filter models for this provider
-    provider_models = []
-    for model_id, info in model_cost.items():
-        # Check if model belongs to this provider
-        model_provider = None
-        if '/' in model_id:
-            model_provider = model_id.split('/')[0]
-        else:
-            # Handle direct model names
-            if model_id.startswith('gpt-') or model_id.startswith('text-') or model_id.startswith('davinci'):
-                model_provider = 'openai'
-            elif model_id.startswith('claude-'):
-                model_provider = 'anthropic'
-            elif model_id.startswith('gemini-'):
-                model_provider = 'google'
-
-        if model_provider != provider:
+    models_by_provider: dict[str, list[dict]] = {}
+    provider_counts: dict[str, int] = {}
+    for model_id, info in cost_map.items():
+        model_provider = provider_for_model_id(model_id)
+        provider_name = model_provider or 'other'
+        provider_counts[provider_name] = provider_counts.get(provider_name, 0) + 1
+
+        # Unrecognized direct model names are counted but not listed
+        if model_provider is None:
             continue
 
         # Extract pricing
@@ -700,7 +1056,7 @@ async def get_provider_models(provider: str):
         if '/' in model_id:
             model_name = model_id.split('/', 1)[1]
 
-        provider_models.append({
+        models_by_provider.setdefault(model_provider, []).append({
             'model_id': model_id,
             'name': model_name,
             'input_cost_per_million': round(input_cost, 2),
@@ -709,24 +1065,256 @@ async def get_provider_models(provider: str):
             'litellm_id': model_id
         })
 
-    # Sort by popularity (common models first) then by name
-    popular_models = ['gpt-4', 'gpt-3.5', 'claude-3', 'claude-haiku', 'claude-sonnet', 'claude-opus', 'gemini-pro', 'gemini-flash']
+    # Build provider list
+    providers = []
+    for provider_name, count in sorted(provider_counts.items(), key=lambda x: (-x[1], x[0])):
+        # Create display name
+        display_name = provider_name.replace('_', ' ').title()
+        if provider_name == 'google':
+            display_name = 'Google (Gemini)'
+        elif provider_name == 'openai':
+            display_name = 'OpenAI (GPT)'
+        elif provider_name == 'anthropic':
+            display_name = 'Anthropic (Claude)'
 
+        providers.append({
+            'name': provider_name,
+            'display_name': display_name,
+            'model_count': count,
+            'popular': provider_name in POPULAR_PROVIDERS
+        })
+
+    # Sort by popularity (common models first) then by name
     def sort_key(model):
         name = model['name'].lower()
         # Check if it's a popular model
-        for i, popular in enumerate(popular_models):
+        for i, popular in enumerate(POPULAR_MODELS):
             if popular in name:
                 return (0, i, name)
         return (1, 0, name)
 
-    provider_models.sort(key=sort_key)
+    provider_models = {}
+    for provider_name, models in models_by_provider.items():
+        models.sort(key=sort_key)
+        provider_models[provider_name] = {
+            'provider': provider_name,
+            'models': models,
+            'count': len(models)
+        }
 
-    return {
-        'provider': provider,
-        'models': provider_models,
-        'count': len(provider_models)
-    }
+    return {'providers': providers}, provider_models
+
+
+def refresh_provider_state(state) -> None:
+    """Cache the serialized /api/providers payloads on state."""
+    providers, provider_models = build_provider_indexes(model_cost)
+    state.provider_index = cache_json(providers)
+    state.provider_models_index = {name: cache_json(payload) for name, payload in provider_models.items()}
+
+
+@app.get("/api/providers")
+async def get_providers(request: Request):
+    """List all available LiteLLM providers with model counts.
+
+    Returns a list of providers that can be used with Apantli, grouped by
+    popularity and showing how many models are available for each.
+    """
+    return cached_json_response(request, request.app.state.provider_index)
+
+
+@app.get("/api/providers/{provider}/models")
+async def get_provider_models(request: Request, provider: str):
+    """List all models for a specific provider with pricing information.
+
+    Args:
+        provider: Provider name (e.g., 'openai', 'anthropic', 'google')
+
+    Returns:
+        List of models with their pricing and context window information
+    """
+    cached = request.app.state.provider_models_index.get(provider)
+    if cached is None:
+        return {'provider': provider, 'models': [], 'count': 0}
+    return cached_json_response(request, cached)
+
+
+class ModelOperationError(Exception):
+    """A model add/update/delete that cannot be applied, reported to the client."""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+def apply_add_model(models: dict, body: dict) -> ModelConfig:
+    """Validate a new model and add it to a models dict.
+
+    Args:
+        models: ModelConfig objects keyed by name (modified in place)
+        body: Request body with model_name, litellm_model, api_key_env and
+            optional enabled, temperature, max_tokens, timeout, num_retries
+
+    Returns:
+        The new ModelConfig
+
+    Raises:
+        ModelOperationError: If fields are missing, the model exists, or the
+            LiteLLM model is unknown
+    """
+    model_name = body.get('model_name')
+    litellm_model = body.get('litellm_model')
+    api_key_env = body.get('api_key_env')
+
+    if not model_name or not litellm_model or not api_key_env:
+        raise ModelOperationError('Missing required fields: model_name, litellm_model, api_key_env')
+    if model_name in models:
+        raise ModelOperationError(f'Model {model_name} already exists')
+    # Validate litellm_model exists in LiteLLM
+    if litellm_model not in model_cost:
+        raise ModelOperationError(f'Unknown LiteLLM model: {litellm_model}')
+
+    model_config = ModelConfig(
+        model_name=model_name,
+        model=litellm_model,
+        api_key=f'os.environ/{api_key_env}',
+        enabled=body.get('enabled', True),
+        temperature=body.get('temperature'),
+        max_tokens=body.get('max_tokens'),
+        timeout=body.get('timeout'),
+        num_retries=body.get('num_retries')
+    )
+    models[model_name] = model_config
+    return model_config
+
+
+def apply_update_model(models: dict, model_name: str, body: dict) -> tuple[ModelConfig, list]:
+    """Validate changed fields for an existing model and replace it in a models dict.
+
+    Args:
+        models: ModelConfig objects keyed by name (modified in place)
+        model_name: Model to update
+        body: Any of enabled, temperature, max_tokens, timeout, num_retries
+
+    Returns:
+        Tuple of (updated ModelConfig, names of the updated fields)
+
+    Raises:
+        ModelOperationError: If the model does not exist (404) or the new
+            values fail validation
+    """
+    if model_name not in models:
+        raise ModelOperationError(f'Model {model_name} not found', 404)
+
+    updated_fields = {}
+    for field in UPDATABLE_MODEL_FIELDS:
+        if field in body:
+            updated_fields[field] = body[field]
+
+    # Validate the same way Config.reload() would
+    try:
+        updated_model = ModelConfig.model_validate({
+            **models[model_name].model_dump(by_alias=True),
+            **updated_fields
+        })
+    except ValidationError as exc:
+        raise ModelOperationError(f'Invalid model configuration: {exc}') from exc
+
+    models[model_name] = updated_model
+    return updated_model, list(updated_fields.keys())
+
+
+def apply_delete_model(models: dict, model_name: str) -> None:
+    """Remove a model from a models dict.
+
+    Raises:
+        ModelOperationError: If the model does not exist (404)
+    """
+    if model_name not in models:
+        raise ModelOperationError(f'Model {model_name} not found', 404)
+    del models[model_name]
+
+
+def write_models_file(config: Config, new_models: dict) -> None:
+    """Back up and write config.yaml; blocking, so run it in a worker thread.
+
+    Backups are skipped if one was taken within the last BACKUP_MIN_INTERVAL
+    seconds, so a burst of edits keeps the configuration from before the
+    first one rather than one file per edit.
+
+    Raises:
+        ConfigError: If writing the config file fails
+    """
+    try:
+        config.backup_config(min_interval=BACKUP_MIN_INTERVAL)
+    except Exception as exc:
+        logging.warning(f"Failed to backup config: {exc}")
+
+    config.write_config(new_models)
+
+
+async def modify_models(state, apply: Callable[[dict], Any],
+                        changed_model: Optional[str] = None) -> Any:
+    """Apply a change to a copy of the models, save it, and make it live.
+
+    state.config_lock serializes the read-modify-write, since the file write
+    runs in a worker thread and another edit could otherwise start from the
+    same models and overwrite this one. Chat requests never take the lock;
+    they keep reading the current snapshot until refresh_model_state()
+    replaces it. The models are already validated, so they are applied
+    directly instead of reparsing config.yaml.
+
+    Args:
+        state: app.state
+        apply: Function that modifies the models dict in place
+        changed_model: Passed to refresh_model_state() when apply only
+            changes that one existing model
+
+    Returns:
+        Whatever apply returns
+
+    Raises:
+        ModelOperationError: From apply; nothing is written
+        ConfigError: If writing the config file fails
+    """
+    async with state.config_lock:
+        new_models = dict(state.config.models)
+        result = apply(new_models)
+        await asyncio.to_thread(write_models_file, state.config, new_models)
+        state.config.models = new_models
+        refresh_model_state(state, changed_model)
+    return result
+
+
+def apply_model_operations(models: dict, operations: list) -> list:
+    """Apply a list of add/update/delete operations to a models dict in order.
+
+    Returns:
+        One result dict per operation
+
+    Raises:
+        ModelOperationError: For the first operation that fails, with its
+            index in the message
+    """
+    results = []
+    for index, operation in enumerate(operations):
+        op = operation.get('op')
+        model_name = operation.get('model_name')
+        try:
+            if op == 'add':
+                apply_add_model(models, operation)
+                results.append({'op': op, 'model_name': model_name})
+            elif op == 'update':
+                _, updated_fields = apply_update_model(models, model_name, operation)
+                results.append({'op': op, 'model_name': model_name, 'updated_fields': updated_fields})
+            elif op == 'delete':
+                apply_delete_model(models, model_name)
+                results.append({'op': op, 'model_name': model_name})
+            else:
+                raise ModelOperationError(f'Unknown op: {op}')
+        except ModelOperationError as exc:
+            raise ModelOperationError(f'Operation {index}: {exc.message}', exc.status_code) from exc
+    return results
 
 
 @app.post("/api/models")
@@ -744,85 +1332,32 @@ async def add_model(request: Request):
         "timeout": 120       // optional
     }
     """
-    from apantli.config import ModelConfig, ConfigError
-
     try:
-        body = await request.json()
+        body = orjson.loads(await request.body())
 
-        # Required fields
-        model_name = body.get('model_name')
-        litellm_model = body.get('litellm_model')
-        api_key_env = body.get('api_key_env')
-
-        if not model_name or not litellm_model or not api_key_env:
-            return JSONResponse(
-                status_code=400,
-                content={'error': 'Missing required fields: model_name, litellm_model, api_key_env'}
-            )
-
-        # Check if model already exists
-        config = request.app.state.config
-        if model_name in config.models:
-            return JSONResponse(
-                status_code=400,
-                content={'error': f'Model {model_name} already exists'}
-            )
-
-        # Validate litellm_model exists in LiteLLM
-        if litellm_model not in model_cost:
-            return JSONResponse(
-                status_code=400,
-                content={'error': f'Unknown LiteLLM model: {litellm_model}'}
-            )
-
-        # Create ModelConfig
-        model_config = ModelConfig(
-            model_name=model_name,
-            model=litellm_model,
-            api_key=f'os.environ/{api_key_env}',
-            enabled=body.get('enabled', True),
-            temperature=body.get('temperature'),
-            max_tokens=body.get('max_tokens'),
-            timeout=body.get('timeout'),
-            num_retries=body.get('num_retries')
-        )
-
-        # Backup config
         try:
-            config.backup_config()
-        except Exception as exc:
-            logging.warning(f"Failed to backup config: {exc}")
-
-        # Add to models dict
-        new_models = {**config.models, model_name: model_config}
-
-        # Write config
-        try:
-            config.write_config(new_models)
+            model_config = await modify_models(
+                request.app.state, lambda models: apply_add_model(models, body)
+            )
+        except ModelOperationError as exc:
+            return ORJSONResponse(status_code=exc.status_code, content={'error': exc.message})
         except ConfigError as exc:
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=500,
                 content={'error': f'Failed to write config: {str(exc)}'}
             )
 
-        # Reload config and update app state
-        config.reload()
-        request.app.state.model_map = config.get_model_map({
-            'timeout': request.app.state.timeout,
-            'num_retries': request.app.state.retries
-        })
-
-        logging.info(f"Added model: {model_name}")
+        logging.info(f"Added model: {model_config.model_name}")
 
         return {
             'status': 'success',
-            'message': f'Model {model_name} added successfully',
+            'message': f'Model {model_config.model_name} added successfully',
             'model': model_config.model_dump(by_alias=True)
         }
 
     except Exception as exc:
         logging.error(f"Error adding model: {exc}")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={'error': str(exc)}
         )
@@ -841,68 +1376,35 @@ async def update_model(model_name: str, request: Request):
         "num_retries": 3
     }
     """
-    from apantli.config import ConfigError
-
     try:
-        body = await request.json()
-        config = request.app.state.config
-
-        # Check if model exists
-        if model_name not in config.models:
-            return JSONResponse(
-                status_code=404,
-                content={'error': f'Model {model_name} not found'}
-            )
-
-        # Get existing model
-        existing_model = config.models[model_name]
-
-        # Update fields
-        updated_fields = {}
-        for field in ['enabled', 'temperature', 'max_tokens', 'timeout', 'num_retries']:
-            if field in body:
-                updated_fields[field] = body[field]
+        body = orjson.loads(await request.body())
 
-        # Create updated model config
-        updated_model = existing_model.model_copy(update=updated_fields)
-
-        # Backup config
         try:
-            config.backup_config()
-        except Exception as exc:
-            logging.warning(f"Failed to backup config: {exc}")
-
-        # Update models dict
-        new_models = {**config.models, model_name: updated_model}
-
-        # Write config
-        try:
-            config.write_config(new_models)
+            updated_model, updated_fields = await modify_models(
+                request.app.state,
+                lambda models: apply_update_model(models, model_name, body),
+                changed_model=model_name
+            )
+        except ModelOperationError as exc:
+            return ORJSONResponse(status_code=exc.status_code, content={'error': exc.message})
         except ConfigError as exc:
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=500,
                 content={'error': f'Failed to write config: {str(exc)}'}
             )
 
-        # Reload config and update app state
-        config.reload()
-        request.app.state.model_map = config.get_model_map({
-            'timeout': request.app.state.timeout,
-            'num_retries': request.app.state.retries
-        })
-
         logging.info(f"Updated model: {model_name}")
 
         return {
             'status': 'success',
             'message': f'Model {model_name} updated successfully',
             'model': updated_model.model_dump(by_alias=True),
-            'updated_fields': list(updated_fields.keys())
+            'updated_fields': updated_fields
         }
 
     except Exception as exc:
         logging.error(f"Error updating model: {exc}")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={'error': str(exc)}
         )
@@ -912,60 +1414,116 @@ async def update_model(model_name: str, request: Request):
 async def delete_model(model_name: str, request: Request):
     """Delete a model from the configuration.
 
-    This removes the model from config.yaml and reloads the configuration.
+    This removes the model from config.yaml and from the live configuration.
     """
-    from apantli.config import ConfigError
-
     try:
-        config = request.app.state.config
-
-        # Check if model exists
-        if model_name not in config.models:
-            return JSONResponse(
-                status_code=404,
-                content={'error': f'Model {model_name} not found'}
+        try:
+            await modify_models(
+                request.app.state, lambda models: apply_delete_model(models, model_name)
+            )
+        except ModelOperationError as exc:
+            return ORJSONResponse(status_code=exc.status_code, content={'error': exc.message})
+        except ConfigError as exc:
+            return ORJSONResponse(
+                status_code=500,
+                content={'error': f'Failed to write config: {str(exc)}'}
             )
 
-        # Backup config
-        try:
-            config.backup_config()
-        except Exception as exc:
-            logging.warning(f"Failed to backup config: {exc}")
+        logging.info(f"Deleted model: {model_name}")
+
+        return {
+            'status': 'success',
+            'message': f'Model {model_name} deleted successfully'
+        }
+
+    except Exception as exc:
+        logging.error(f"Error deleting model: {exc}")
+        return ORJSONResponse(
+            status_code=500,
+            content={'error': str(exc)}
+        )
+
 
-        # Remove from models dict
-        new_models = {k: v for k, v in config.models.items() if k != model_name}
+@app.post("/api/models/batch")
+async def batch_models(request: Request):
+    """Apply several model changes with one backup and one config write.
+
+    Request body:
+    {
+        "operations": [
+            {"op": "add", "model_name": "my-model", "litellm_model": "openai/gpt-4",
+             "api_key_env": "OPENAI_API_KEY"},
+            {"op": "update", "model_name": "gpt-4", "enabled": false},
+            {"op": "delete", "model_name": "old-model"}
+        ]
+    }
+
+    Operations are applied in order. If any of them fails, nothing is
+    written and the error names the failing operation's index.
+    """
+    try:
+        body = orjson.loads(await request.body())
+        operations = body.get('operations')
+        if not isinstance(operations, list) or not operations:
+            return ORJSONResponse(
+                status_code=400,
+                content={'error': 'Missing required field: operations'}
+            )
 
-        # Write config
         try:
-            config.write_config(new_models)
+            results = await modify_models(
+                request.app.state, lambda models: apply_model_operations(models, operations)
+            )
+        except ModelOperationError as exc:
+            return ORJSONResponse(status_code=exc.status_code, content={'error': exc.message})
         except ConfigError as exc:
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=500,
                 content={'error': f'Failed to write config: {str(exc)}'}
             )
 
-        # Reload config and update app state
-        config.reload()
-        request.app.state.model_map = config.get_model_map({
-            'timeout': request.app.state.timeout,
-            'num_retries': request.app.state.retries
-        })
-
-        logging.info(f"Deleted model: {model_name}")
+        logging.info(f"Applied {len(results)} model operation(s)")
 
         return {
             'status': 'success',
-            'message': f'Model {model_name} deleted successfully'
+            'message': f'Applied {len(results)} model operation(s)',
+            'operations': results
         }
 
     except Exception as exc:
-        logging.error(f"Error deleting model: {exc}")
-        return JSONResponse(
+        logging.error(f"Error applying model operations: {exc}")
+        return ORJSONResponse(
             status_code=500,
             content={'error': str(exc)}
         )
 
 
+def build_obsidian_export(pricing_index: dict, enabled_models: frozenset) -> dict:
+    """Build the request-independent part of the Obsidian Copilot export.
+
+    This only depends on the configuration, so it runs from
+    refresh_model_state() and the endpoint just adds base_url and exported_at.
+
+    Args:
+        pricing_index: Result of build_pricing_index()
+        enabled_models: Names of models enabled for API requests
+
+    Returns:
+        Export dict without base_url and exported_at
+    """
+    return {
+        'version': '1.0',
+        'client': 'obsidian-copilot',
+        'models': [
+            {'id': model_name, 'name': model_name, **pricing}
+            for model_name, pricing in pricing_index.items()
+            if model_name in enabled_models
+        ],
+        'exported_from': 'apantli',
+        'note': 'Use any value for API key in Obsidian - Apantli handles authentication internally'
+    }
+
+
 @app.get("/api/export/obsidian")
 async def export_obsidian(request: Request):
     """Export enabled models in Obsidian Copilot compatible format.
@@ -973,73 +1531,33 @@ async def export_obsidian(request: Request):
     Returns JSON configuration that can be imported into Obsidian Copilot
     for using Apantli as a custom provider.
     """
-    from datetime import datetime
-    import litellm
-
     try:
-        config = request.app.state.config
-
         # Get base URL from request
         # Use X-Forwarded-Host if behind proxy, otherwise use Host header
         host = request.headers.get('X-Forwarded-Host') or request.headers.get('Host') or 'localhost:4000'
         scheme = 'https' if request.headers.get('X-Forwarded-Proto') == 'https' else 'http'
         base_url = f"{scheme}://{host}/v1"
 
-        # Filter for enabled models only
-        enabled_models = []
-        for model_name, model_config in config.models.items():
-            if not model_config.enabled:
-                continue
-
-            # Get pricing info
-            litellm_model = model_config.litellm_model
-            input_cost = None
-            output_cost = None
-
-            try:
-                model_data = None
-                if litellm_model in litellm.model_cost:
-                    model_data = litellm.model_cost[litellm_model]
-                elif '/' in litellm_model:
-                    model_without_provider = litellm_model.split('/', 1)[1]
-                    if model_without_provider in litellm.model_cost:
-                        model_data = litellm.model_cost[model_without_provider]
-
-                if model_data:
-                    input_cost_per_token = model_data.get('input_cost_per_token', 0)
-                    output_cost_per_token = model_data.get('output_cost_per_token', 0)
-                    if input_cost_per_token:
-                        input_cost = round(input_cost_per_token * 1_000_000, 2)
-                    if output_cost_per_token:
-                        output_cost = round(output_cost_per_token * 1_000_000, 2)
-            except Exception:
-                pass
-
-            # Extract provider
-            provider = litellm_model.split('/')[0] if '/' in litellm_model else 'unknown'
-
-            enabled_models.append({
-                'id': model_name,
-                'name': model_name,
-                'provider': provider,
-                'litellm_model': litellm_model,
-                'input_cost_per_million': input_cost,
-                'output_cost_per_million': output_cost
-            })
-
-        return {
-            'version': '1.0',
-            'client': 'obsidian-copilot',
-            'base_url': base_url,
-            'models': enabled_models,
-            'exported_at': datetime.utcnow().isoformat() + 'Z',
-            'exported_from': 'apantli',
-            'note': 'Use any value for API key in Obsidian - Apantli handles authentication internally'
-        }
+        # The export only changes with the config and the base URL, so
+        # clients holding a current copy get a 304
+        snapshot = request.app.state.snapshot
+        etag_source = f"{snapshot.obsidian_etag} {base_url}".encode()
+        headers = {'ETag': f'"{hashlib.blake2b(etag_source, digest_size=8).hexdigest()}"'}
+        if request.headers.get('if-none-match') == headers['ETag']:
+            return Response(status_code=304, headers=headers)
+
+        return ORJSONResponse(
+            content={
+                **snapshot.obsidian_export,
+                'base_url': base_url,
+                'exported_at': datetime.utcnow().isoformat() + 'Z'
+            },
+            headers=headers
+        )
 
     except Exception as exc:
         logging.error(f"Error exporting Obsidian config: {exc}")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={'error': str(exc)}
         )
@@ -1050,7 +1568,7 @@ async def requests(request: Request, hours: Optional[int] = None, start_date: Op
                   timezone_offset: Optional[int] = None, offset: int = 0, limit: int = 50,
                   provider: Optional[str] = None, model: Optional[str] = None,
                   min_cost: Optional[float] = None, max_cost: Optional[float] = None, search: Optional[str] = None,
-                  sort_by: Optional[str] = None, sort_dir: str = "desc"):
+                  sort_by: Optional[str] = None, sort_dir: str = "desc", before: Optional[str] = None):
     """Get recent requests with full details, optionally filtered by time range and attributes.
 
     Parameters:
@@ -1065,6 +1583,8 @@ async def requests(request: Request, hours: Optional[int] = None, start_date: Op
     - min_cost: Minimum cost threshold
     - max_cost: Maximum cost threshold
     - search: Search in model name or request/response content
+    - before: Only requests older than this UTC timestamp; pass the last
+      timestamp of a newest-first page to fetch the next one without OFFSET
     """
     # Limit the max page size
     limit = min(limit, 200)
@@ -1085,9 +1605,10 @@ async def requests(request: Request, hours: Optional[int] = None, start_date: Op
         max_cost=max_cost,
         search=search,
         sort_by=sort_by,
-        sort_dir=sort_dir
+        sort_dir=sort_dir,
+        before=before
     )
-    return await db.get_requests(filters)
+    return ORJSONResponse(content=await db.get_requests(filters))
 
 
 @app.get("/stats")
@@ -1100,12 +1621,11 @@ async def stats(request: Request, hours: Optional[int] = None, start_date: Optio
     - end_date: ISO 8601 date (YYYY-MM-DD)
     - timezone_offset: Timezone offset in minutes from UTC (e.g., -480 for PST)
     """
-    # Build time filter using efficient timestamp comparisons
-    time_filter, time_params = build_time_filter(hours, start_date, end_date, timezone_offset)
+    start_utc, end_utc = build_time_range(hours, start_date, end_date, timezone_offset)
 
     # Use Database instance from app state
     db = request.app.state.db
-    return await db.get_stats(time_filter=time_filter, time_params=time_params)
+    return ORJSONResponse(content=await db.get_stats(start_utc, end_utc))
 
 
 @app.delete("/errors")
@@ -1125,34 +1645,19 @@ async def stats_daily(request: Request, start_date: Optional[str] = None, end_da
     - end_date: ISO 8601 date (YYYY-MM-DD), defaults to today
     - timezone_offset: Timezone offset in minutes from UTC (e.g., -480 for PST)
     """
-    # Set default date range if not provided
-    if not end_date:
-        end_date = datetime.utcnow().strftime('%Y-%m-%d')
-    if not start_date:
-        # Default to 30 days ago
-        start = datetime.utcnow() - timedelta(days=30)
-        start_date = start.strftime('%Y-%m-%d')
-
-    # Build WHERE clause using efficient timestamp comparisons
-    # and GROUP BY using timezone-adjusted dates
-    if timezone_offset is not None:
-        # Convert local date range to UTC timestamps for efficient WHERE clause
-        start_utc, _ = convert_local_date_to_utc_range(start_date, timezone_offset)
-        _, end_utc = convert_local_date_to_utc_range(end_date, timezone_offset)
-        where_filter = "timestamp >= ? AND timestamp < ?"
-        where_params = [start_utc, end_utc]
-    else:
-        # No timezone conversion needed
-        end_dt = datetime.fromisoformat(end_date) + timedelta(days=1)
-        where_filter = "timestamp >= ? AND timestamp < ?"
-        where_params = [f"{start_date}T00:00:00", f"{end_dt.date()}T00:00:00"]
+    # Set default date range if not provided (30 days ago through today)
+    if not start_date or not end_date:
+        default_start, default_end = default_date_range()
+        start_date = start_date or default_start
+        end_date = end_date or default_end
 
-    # Build date expression for GROUP BY
-    date_expr = build_date_expr(timezone_offset)
+    # Filter on a UTC timestamp range for efficient indexed queries
+    # and GROUP BY using timezone-adjusted dates
+    start_utc, end_utc = build_utc_range(start_date, end_date, timezone_offset)
 
     # Use Database instance from app state
     db = request.app.state.db
-    return await db.get_daily_stats(start_date, end_date, where_filter, date_expr, where_params)
+    return ORJSONResponse(content=await db.get_daily_stats(start_utc, end_utc, timezone_offset))
 
 
 @app.get("/stats/hourly")
@@ -1163,89 +1668,143 @@ async def stats_hourly(request: Request, date: str, timezone_offset: Optional[in
     - date: ISO 8601 date (YYYY-MM-DD)
     - timezone_offset: Timezone offset in minutes from UTC (e.g., -480 for PST)
     """
-    # Build WHERE clause using efficient timestamp comparisons
+    # Filter on a UTC timestamp range for efficient indexed queries
     # and GROUP BY using timezone-adjusted hours
-    if timezone_offset is not None:
-        # Convert local date range to UTC timestamps for efficient WHERE clause
-        start_utc, end_utc = convert_local_date_to_utc_range(date, timezone_offset)
-        where_filter = "timestamp >= ? AND timestamp < ?"
-        where_params = [start_utc, end_utc]
-    else:
-        # No timezone conversion needed
-        end_dt = datetime.fromisoformat(date) + timedelta(days=1)
-        where_filter = "timestamp >= ? AND timestamp < ?"
-        where_params = [f"{date}T00:00:00", f"{end_dt.date()}T00:00:00"]
-
-    # Build hour expression for GROUP BY
-    hour_expr = build_hour_expr(timezone_offset)
+    start_utc, end_utc = build_utc_range(date, date, timezone_offset)
 
     # Use Database instance from app state
     db = request.app.state.db
-    result = await db.get_hourly_stats(where_filter, hour_expr, where_params)
-
-    # Ensure all 24 hours are present (fill missing hours with zeros)
-    hourly_dict = {h['hour']: h for h in result['hourly']}
-    hourly_list = []
-    for hour in range(24):
-        if hour in hourly_dict:
-            hourly_list.append(hourly_dict[hour])
-        else:
-            hourly_list.append({
-                'hour': hour,
-                'requests': 0,
-                'cost': 0.0,
-                'total_tokens': 0,
-                'by_model': []
-            })
+    result = await db.get_hourly_stats(start_utc, end_utc, timezone_offset)
 
-    return {
-        'hourly': hourly_list,
+    # get_hourly_stats() already returns all 24 hours, zero-filled
+    return ORJSONResponse(content={
+        'hourly': result['hourly'],
         'date': date,
         'total_cost': result['total_cost'],
         'total_requests': result['total_requests']
-    }
+    })
+
+
+async def cached_stats_response(request: Request, name: str,
+                                query: Callable[[], Awaitable[dict]]) -> Response:
+    """Serve a slow-changing whole-table query from a short-lived cache.
+
+    Results are reused until the database records a write or
+    STATS_CACHE_TTL seconds pass (the TTL covers writes from other
+    processes, such as utils/recalculate_costs.py), and browsers may reuse
+    them for the same TTL.
+
+    Args:
+        request: Incoming request
+        name: Cache slot for this query
+        query: Coroutine function running the query
+    """
+    db = request.app.state.db
+    cache = request.app.state.stats_cache
+    now = time.monotonic()
+    entry = cache.get(name)
+    if entry is not None and entry[0] == db.generation and entry[1] > now:
+        body = entry[2]
+    else:
+        generation = db.generation
+        body = orjson.dumps(await query())
+        cache[name] = (generation, now + STATS_CACHE_TTL, body)
+    return Response(
+        content=body,
+        media_type='application/json',
+        headers={'Cache-Control': f'max-age={STATS_CACHE_TTL}'}
+    )
 
 
 @app.get("/stats/date-range")
 async def stats_date_range(request: Request):
     """Get the actual date range of data in the database."""
     db = request.app.state.db
-    return await db.get_date_range()
+    return await cached_stats_response(request, 'date_range', db.get_date_range)
 
 
 @app.get("/stats/filters")
 async def stats_filters(request: Request):
     """Get available filter values (providers and models) with usage counts."""
     db = request.app.state.db
-    return await db.get_filter_values()
+    return await cached_stats_response(request, 'filters', db.get_filter_values)
 
 
 @app.get("/")
 async def dashboard(request: Request):
     """Simple HTML dashboard."""
-    response = templates.TemplateResponse("dashboard.html", {"request": request})
-    # Prevent browser caching of the HTML to avoid stale UI bugs
-    response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-    response.headers["Pragma"] = "no-cache"
-    response.headers["Expires"] = "0"
-    return response
+    if 'gzip' in request.headers.get('accept-encoding', ''):
+        return Response(
+            content=request.app.state.dashboard_gzip,
+            media_type="text/html",
+            headers={**NO_CACHE_HEADERS, "Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
+        )
+    return Response(
+        content=request.app.state.dashboard_html,
+        media_type="text/html",
+        headers=NO_CACHE_HEADERS
+    )
 
 
 @app.get("/compare")
 async def compare_page(request: Request):
     """Chat comparison interface for testing multiple models side-by-side."""
-    response = templates.TemplateResponse(
-        "compare.html",
-        {
-            "request": request,
-            "models": list(request.app.state.model_map.keys())
-        }
+    return Response(
+        content=request.app.state.snapshot.compare_html,
+        media_type="text/html",
+        headers=NO_CACHE_HEADERS
     )
-    # Prevent browser caching of the HTML to avoid stale UI bugs
-    response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-    response.headers["Pragma"] = "no-cache"
-    response.headers["Expires"] = "0"
-    return response
+
+
+def select_server_backends(loop: str = "auto") -> tuple[str, str]:
+    """Pick the uvicorn event loop and HTTP parser implementations.
+
+    Prefers uvloop and httptools (installed with uvicorn[standard]), which
+    are faster than the pure-Python defaults. Falls back to asyncio/h11
+    when they are not installed (uvloop is unavailable on Windows).
+
+    Args:
+        loop: "auto", "uvloop", or "asyncio" (from --loop)
+    """
+    if loop == "auto":
+        loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    return loop, http
+
+
+def get_server_urls(port: int) -> list:
+    """List the URLs the server is reachable at when bound to 0.0.0.0.
+
+    Resolving the hostname is a single lookup and usually finds the LAN
+    address. If it does not, the address of the default route is read from
+    a UDP socket "connected" to a non-routable address (no packet is sent),
+    instead of walking every interface, which is slow on hosts with many
+    virtual interfaces (Docker, VPNs).
+    """
+    addresses = [f"http://localhost:{port}/"]
+
+    def add(ip: Optional[str]):
+        # Skip loopback and IPv6 addresses
+        if ip and ':' not in ip and not ip.startswith('127.'):
+            url = f"http://{ip}:{port}/"
+            if url not in addresses:
+                addresses.append(url)
+
+    try:
+        for info in socket.getaddrinfo(socket.gethostname(), None, socket.AF_INET):
+            add(str(info[4][0]))
+    except (OSError, socket.error):
+        pass
+
+    if len(addresses) == 1:
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+                sock.connect(("10.255.255.255", 1))
+                add(sock.getsockname()[0])
+        except OSError:
+            pass
+
+    return addresses
 
 
 def main():
@@ -1291,6 +1850,18 @@ def main():
         default=3,
         help="Default number of retry attempts (default: 3)"
     )
+    parser.add_argument(
+        "--loop",
+        choices=["auto", "uvloop", "asyncio"],
+        default="auto",
+        help="Event loop implementation; auto uses uvloop when installed (default: auto)"
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=1024,
+        help="Max cached temperature-0 responses, 0 to disable (default: 1024)"
+    )
 
     args = parser.parse_args()
 
@@ -1304,6 +1875,7 @@ def main():
     app.state.db_path = args.db
     app.state.timeout = args.timeout
     app.state.retries = args.retries
+    app.state.cache_size = args.cache_size
 
     # Configure logging format with timestamps
     log_config = uvicorn.config.LOGGING_CONFIG
@@ -1317,43 +1889,13 @@ def main():
     # Print available URLs
     print(f"\n🚀 Apantli server starting...")
     if args.host == "0.0.0.0":
-        # Get all network interfaces
-        import netifaces
-        addresses = []
-
-        # Add localhost
-        addresses.append(f"http://localhost:{args.port}/")
-
-        # Get all network interfaces and their addresses
-        try:
-            for interface in netifaces.interfaces():
-                addrs = netifaces.ifaddresses(interface)
-                # Get IPv4 addresses (AF_INET = 2)
-                if netifaces.AF_INET in addrs:
-                    for addr_info in addrs[netifaces.AF_INET]:
-                        ip = addr_info.get('addr')
-                        # Skip localhost IPs
-                        if ip and ip != '127.0.0.1':
-                            url = f"http://{ip}:{args.port}/"
-                            if url not in addresses:
-                                addresses.append(url)
-        except Exception as exc:
-            # Fallback to hostname lookup
-            try:
-                hostname = socket.gethostname()
-                for info in socket.getaddrinfo(hostname, None):
-                    ip = str(info[4][0])  # Convert to string for consistent handling
-                    if ':' not in ip and ip != '127.0.0.1':
-                        url = f"http://{ip}:{args.port}/"
-                        if url not in addresses:
-                            addresses.append(url)
-            except (OSError, socket.error):
-                pass
-
+        addresses = get_server_urls(args.port)
         print(f"   Server at {' or '.join(addresses)}\n")
     else:
         print(f"   Server at http://{args.host}:{args.port}/\n")
 
+    loop, http = select_server_backends(args.loop)
+
     if args.reload:
         # Reload mode requires import string
         uvicorn.run(
@@ -1361,6 +1903,8 @@ def main():
             host=args.host,
             port=args.port,
             reload=args.reload,
+            loop=loop,
+            http=http,
             log_config=log_config
         )
     else:
@@ -1369,6 +1913,8 @@ def main():
             app,
             host=args.host,
             port=args.port,
+            loop=loop,
+            http=http,
             log_config=log_config
         )
 
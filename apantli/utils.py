@@ -1,6 +1,8 @@
 """Utility functions for date/time operations."""
 
-from datetime import datetime, timedelta
+import time
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Optional
 
 
@@ -24,11 +26,50 @@ def convert_local_date_to_utc_range(date_str: str, timezone_offset_minutes: int)
   return utc_start.isoformat(), utc_end.isoformat()
 
 
-def build_time_filter(hours: Optional[int] = None,
+def build_utc_range(start_date: str, end_date: str,
+                    timezone_offset: Optional[int] = None) -> tuple[str, str]:
+  """Convert an inclusive local date range to a UTC timestamp range.
+
+  Args:
+    start_date: ISO date string (YYYY-MM-DD) for range start
+    end_date: ISO date string (YYYY-MM-DD) for range end (inclusive)
+    timezone_offset: Browser timezone offset in minutes from UTC, or None for UTC
+
+  Returns:
+    (start_utc, end_utc) as ISO timestamp strings (inclusive start, exclusive end)
+  """
+  if timezone_offset is not None:
+    start_utc, _ = convert_local_date_to_utc_range(start_date, timezone_offset)
+    _, end_utc = convert_local_date_to_utc_range(end_date, timezone_offset)
+    return start_utc, end_utc
+
+  # No timezone conversion needed
+  end_dt = datetime.fromisoformat(end_date) + timedelta(days=1)
+  return f"{start_date}T00:00:00", f"{end_dt.date()}T00:00:00"
+
+
+def default_date_range(days: int = 30) -> tuple[str, str]:
+  """Get the default (start_date, end_date) for stats: the last N days up to today (UTC).
+
+  Returns:
+    (start_date, end_date) as ISO date strings
+  """
+  # Days since the epoch in UTC; the strings only change at midnight
+  return _date_range_for_day(int(time.time() // 86400), days)
+
+
+@lru_cache(maxsize=8)
+def _date_range_for_day(epoch_day: int, days: int) -> tuple[str, str]:
+  """Format the date range ending on a given day since the epoch."""
+  end = date(1970, 1, 1) + timedelta(days=epoch_day)
+  return (end - timedelta(days=days)).isoformat(), end.isoformat()
+
+
+def build_time_range(hours: Optional[int] = None,
                      start_date: Optional[str] = None,
                      end_date: Optional[str] = None,
-                     timezone_offset: Optional[int] = None) -> tuple[str, list]:
-  """Build SQL time filter clause with timezone handling.
+                     timezone_offset: Optional[int] = None) -> tuple[Optional[str], Optional[str]]:
+  """Convert stats time parameters to a UTC timestamp range.
 
   Args:
     hours: Filter to last N hours
@@ -37,81 +78,94 @@ def build_time_filter(hours: Optional[int] = None,
     timezone_offset: Browser timezone offset in minutes from UTC
 
   Returns:
-    Tuple of (SQL WHERE clause fragment, list of parameters)
-    e.g., ("AND timestamp >= ?", ["2025-10-01T00:00:00"]) or ("", [])
+    (start_utc, end_utc) as ISO timestamp strings (inclusive start, exclusive
+    end), either of which is None when that side is unbounded
   """
   if hours:
-    return (f"AND datetime(timestamp) > datetime('now', ?)", [f'-{hours} hours'])
+    # Not cached, since the cutoff moves with the clock
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
+    return cutoff.strftime('%Y-%m-%dT%H:%M:%S'), None
+  return _build_time_range(start_date, end_date, timezone_offset)
 
+
+@lru_cache(maxsize=256)
+def _build_time_range(start_date: Optional[str], end_date: Optional[str],
+                      timezone_offset: Optional[int]) -> tuple[Optional[str], Optional[str]]:
+  """Cached body of build_time_range() for date filters; dashboards repeat them."""
   if start_date and end_date:
-    if timezone_offset is not None:
-      # Convert local date range to UTC timestamps for efficient indexed queries
-      start_utc, _ = convert_local_date_to_utc_range(start_date, timezone_offset)
-      _, end_utc = convert_local_date_to_utc_range(end_date, timezone_offset)
-      return ("AND timestamp >= ? AND timestamp < ?", [start_utc, end_utc])
-    else:
-      # No timezone conversion needed
-      end_dt = datetime.fromisoformat(end_date) + timedelta(days=1)
-      return ("AND timestamp >= ? AND timestamp < ?", [f"{start_date}T00:00:00", f"{end_dt.date()}T00:00:00"])
+    return build_utc_range(start_date, end_date, timezone_offset)
 
+  start_utc = end_utc = None
   if start_date:
     if timezone_offset is not None:
       start_utc, _ = convert_local_date_to_utc_range(start_date, timezone_offset)
-      return ("AND timestamp >= ?", [start_utc])
     else:
-      return ("AND timestamp >= ?", [f"{start_date}T00:00:00"])
-
+      start_utc = f"{start_date}T00:00:00"
   if end_date:
     if timezone_offset is not None:
       _, end_utc = convert_local_date_to_utc_range(end_date, timezone_offset)
-      return ("AND timestamp < ?", [end_utc])
     else:
       end_dt = datetime.fromisoformat(end_date) + timedelta(days=1)
-      return ("AND timestamp < ?", [f"{end_dt.date()}T00:00:00"])
+      end_utc = f"{end_dt.date()}T00:00:00"
+  return start_utc, end_utc
 
-  return ("", [])
 
+def build_range_filter(start_utc: Optional[str], end_utc: Optional[str],
+                       column: str = 'timestamp') -> tuple[str, list]:
+  """Build a SQL filter clause for a half-open range on a column.
 
-def build_timezone_modifier(timezone_offset: int) -> str:
-  """Convert timezone offset in minutes to SQLite modifier string.
+  Comparing the stored value against bound parameters (rather than calling
+  datetime() on every row) lets SQLite use the timestamp indexes.
 
   Args:
-    timezone_offset: Minutes from UTC (e.g., -480 for PST, +60 for CET)
+    start_utc: Inclusive lower bound, or None
+    end_utc: Exclusive upper bound, or None
+    column: Column to compare
 
   Returns:
-    SQLite datetime modifier (e.g., "-08:00" for PST, "+01:00" for CET)
+    Tuple of (SQL WHERE clause fragment, list of parameters)
   """
-  hours = abs(timezone_offset) // 60
-  minutes = abs(timezone_offset) % 60
-  sign = '+' if timezone_offset >= 0 else '-'
-  return f"{sign}{hours:02d}:{minutes:02d}"
+  clause = ""
+  params = []
+  if start_utc:
+    clause += f"AND {column} >= ?"
+    params.append(start_utc)
+  if end_utc:
+    clause += f"{' ' if clause else ''}AND {column} < ?"
+    params.append(end_utc)
+  return clause, params
 
 
-def build_date_expr(timezone_offset: Optional[int]) -> str:
-  """Build SQL date expression with optional timezone conversion.
+def build_time_filter(hours: Optional[int] = None,
+                     start_date: Optional[str] = None,
+                     end_date: Optional[str] = None,
+                     timezone_offset: Optional[int] = None) -> tuple[str, list]:
+  """Build SQL time filter clause with timezone handling.
 
   Args:
-    timezone_offset: Minutes from UTC, or None for UTC
+    hours: Filter to last N hours
+    start_date: ISO date string (YYYY-MM-DD) for range start
+    end_date: ISO date string (YYYY-MM-DD) for range end
+    timezone_offset: Browser timezone offset in minutes from UTC
 
   Returns:
-    SQL expression for extracting date (e.g., "DATE(timestamp, '-08:00')")
+    Tuple of (SQL WHERE clause fragment, list of parameters)
+    e.g., ("AND timestamp >= ?", ["2025-10-01T00:00:00"]) or ("", [])
   """
-  if timezone_offset is not None:
-    tz_mod = build_timezone_modifier(timezone_offset)
-    return f"DATE(timestamp, '{tz_mod}')"
-  return "DATE(timestamp)"
+  return build_range_filter(*build_time_range(hours, start_date, end_date, timezone_offset))
 
 
-def build_hour_expr(timezone_offset: Optional[int]) -> str:
-  """Build SQL hour expression with optional timezone conversion.
+@lru_cache(maxsize=256)
+def build_timezone_modifier(timezone_offset: int) -> str:
+  """Convert timezone offset in minutes to SQLite modifier string.
 
   Args:
-    timezone_offset: Minutes from UTC, or None for UTC
+    timezone_offset: Minutes from UTC (e.g., -480 for PST, +60 for CET)
 
   Returns:
-    SQL expression for extracting hour as integer
+    SQLite datetime modifier (e.g., "-08:00" for PST, "+01:00" for CET)
   """
-  if timezone_offset is not None:
-    tz_mod = build_timezone_modifier(timezone_offset)
-    return f"CAST(strftime('%H', timestamp, '{tz_mod}') AS INTEGER)"
-  return "CAST(strftime('%H', timestamp) AS INTEGER)"
+  hours = abs(timezone_offset) // 60
+  minutes = abs(timezone_offset) % 60
+  sign = '+' if timezone_offset >= 0 else '-'
+  return f"{sign}{hours:02d}:{minutes:02d}"
@@ -0,0 +1,63 @@
+"""Unit tests for the response cache."""
+
+import pytest
+from apantli.cache import ResponseCache
+
+
+@pytest.fixture
+def request_data():
+  """Provide a resolved temperature-0 request."""
+  return {
+    'model': 'openai/gpt-4',
+    'messages': [{'role': 'user', 'content': 'Hello'}],
+    'temperature': 0,
+    'api_key': 'sk-test',
+    'timeout': 120,
+    'num_retries': 3,
+  }
+
+
+def test_make_key_deterministic_requests_only(request_data):
+  """Test only non-streaming temperature-0 requests get a key."""
+  assert ResponseCache.make_key(request_data) is not None
+  assert ResponseCache.make_key({**request_data, 'temperature': 0.7}) is None
+  assert ResponseCache.make_key({**request_data, 'stream': True}) is None
+  assert ResponseCache.make_key({k: v for k, v in request_data.items() if k != 'temperature'}) is None
+
+
+def test_make_key_ignores_transport_params(request_data):
+  """Test keys depend on the completion parameters, not keys or timeouts."""
+  key = ResponseCache.make_key(request_data)
+
+  assert ResponseCache.make_key({**request_data, 'api_key': 'sk-other', 'timeout': 30}) == key
+  assert ResponseCache.make_key({**request_data, 'max_tokens': 10}) != key
+  assert ResponseCache.make_key({**request_data, 'messages': [{'role': 'user', 'content': 'Hi'}]}) != key
+
+
+def test_get_put_evicts_least_recently_used():
+  """Test the cache holds at most maxsize entries, evicting LRU first."""
+  cache = ResponseCache(maxsize=2)
+  cache.put(b'a', b'{"id": "a"}')
+  cache.put(b'b', b'{"id": "b"}')
+  assert cache.get(b'a') == b'{"id": "a"}'
+
+  cache.put(b'c', b'{"id": "c"}')
+
+  assert len(cache) == 2
+  assert cache.get(b'b') is None
+  assert cache.get(b'a') == b'{"id": "a"}'
+  assert cache.get(b'c') == b'{"id": "c"}'
+
+
+def test_get_expired_entry(monkeypatch):
+  """Test entries older than the TTL are dropped."""
+  now = [1000.0]
+  monkeypatch.setattr('apantli.cache.time.monotonic', lambda: now[0])
+  cache = ResponseCache(ttl=60)
+  cache.put(b'a', b'{"id": "a"}')
+
+  now[0] += 59
+  assert cache.get(b'a') == b'{"id": "a"}'
+  now[0] += 2
+  assert cache.get(b'a') is None
+  assert len(cache) == 0
@@ -199,6 +199,19 @@ def test_config_list_models(temp_config_file, sample_config_content, monkeypatch
   assert len(models) == 2
 
 
+def test_config_get_enabled_models(temp_config_file, sample_config_content, monkeypatch):
+  """Test enabled model names exclude models with enabled: false."""
+  monkeypatch.setenv('OPENAI_API_KEY', 'sk-test')
+  monkeypatch.setenv('ANTHROPIC_API_KEY', 'sk-test')
+
+  with open(temp_config_file, 'w') as f:
+    f.write(sample_config_content.replace("      timeout: 180\n", "      timeout: 180\n      enabled: false\n"))
+
+  config = Config(temp_config_file)
+
+  assert config.get_enabled_models() == frozenset({'gpt-4'})
+
+
 def test_config_missing_file(temp_config_file, caplog):
   """Test loading config when file doesn't exist."""
   # Use a file path that doesn't exist
@@ -279,6 +292,8 @@ def test_config_get_model_map(temp_config_file, sample_config_content, monkeypat
   assert 'gpt-4' in model_map
   assert 'claude-3' in model_map
   assert model_map['gpt-4']['model'] == 'openai/gpt-4'
+  # API keys are resolved from the environment
+  assert model_map['gpt-4']['api_key'] == 'sk-test'
 
 
 def test_config_get_model_map_with_defaults(temp_config_file, sample_config_content, monkeypatch):
@@ -324,3 +339,18 @@ def test_model_config_extra_fields_allowed(monkeypatch):
   params = config.to_litellm_params()
   assert params.get('custom_param') == 'custom_value'
   assert params.get('another_param') == 42
+
+
+def test_config_backup_min_interval(temp_config_file, sample_config_content, monkeypatch):
+  """Test backups within min_interval reuse the newest backup."""
+  monkeypatch.setenv('OPENAI_API_KEY', 'sk-test')
+  monkeypatch.setenv('ANTHROPIC_API_KEY', 'sk-ant-test')
+  with open(temp_config_file, 'w') as f:
+    f.write(sample_config_content)
+  config = Config(temp_config_file)
+
+  first = config.backup_config()
+  assert first.exists()
+
+  assert config.backup_config(min_interval=60) == first
+  assert len(config._list_backups()) == 1
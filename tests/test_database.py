@@ -4,7 +4,7 @@ import pytest
 import aiosqlite
 import json
 from datetime import datetime
-from apantli.database import Database
+from apantli.database import Database, RequestFilter
 
 
 @pytest.mark.asyncio
@@ -34,6 +34,15 @@ async def test_init_db(temp_db):
       assert 'idx_timestamp' in indexes
       assert 'idx_date_provider' in indexes
       assert 'idx_cost' in indexes
+      assert 'idx_success_timestamp' in indexes
+      assert 'idx_error_timestamp' in indexes
+      assert 'idx_model' in indexes
+      assert 'idx_provider' in indexes
+      assert 'idx_success_stats' in indexes
+
+    # WAL mode persists in the database file
+    async with conn.execute("PRAGMA journal_mode") as cursor:
+      assert (await cursor.fetchone())[0] == 'wal'
 
 
 @pytest.mark.asyncio
@@ -123,7 +132,6 @@ async def test_log_request_error(temp_db, sample_request_data):
 
 
 @pytest.mark.asyncio
-@pytest.mark.skip(reason="API key redaction not yet implemented - see CODE_REVIEW.md recommendation #7")
 async def test_log_request_api_key_redaction(temp_db, sample_response, sample_request_data):
   """Test that API keys are redacted in stored request data."""
   db = Database(temp_db)
@@ -298,3 +306,206 @@ async def test_database_class_direct(temp_db):
 
     assert row[0] == 'test-model'
     assert row[1] == 'test-provider'
+
+
+@pytest.mark.asyncio
+async def test_log_requests_batch(temp_db, sample_response, sample_request_data):
+  """Test inserting several prebuilt rows in one batch."""
+  db = Database(temp_db)
+  await db.init()
+
+  rows = [
+    Database.build_request_row(f'gpt-{i}', 'openai', sample_response, 100, sample_request_data)
+    for i in range(3)
+  ]
+  rows.append(Database.build_request_row('gpt-4', 'openai', None, 50, sample_request_data, error='Timeout: slow'))
+  await db.log_requests_batch(rows)
+
+  async with aiosqlite.connect(temp_db) as conn:
+    async with conn.execute("SELECT model, error FROM requests ORDER BY id") as cursor:
+      stored = await cursor.fetchall()
+
+  assert [row[0] for row in stored] == ['gpt-0', 'gpt-1', 'gpt-2', 'gpt-4']
+  assert stored[3][1] == 'Timeout: slow'
+
+
+@pytest.mark.asyncio
+async def test_background_writer_flushes_on_stop(temp_db, sample_response, sample_request_data):
+  """Test queued log rows are batched and flushed when the writer stops."""
+  db = Database(temp_db)
+  await db.init()
+  db.start_writer()
+
+  for _ in range(5):
+    await db.log_request('gpt-4', 'openai', sample_response, 100, sample_request_data)
+  await db.stop_writer()
+
+  async with aiosqlite.connect(temp_db) as conn:
+    async with conn.execute("SELECT COUNT(*) FROM requests") as cursor:
+      assert (await cursor.fetchone())[0] == 5
+
+  # After stopping, rows are written immediately again
+  await db.log_request('gpt-4', 'openai', sample_response, 100, sample_request_data)
+  async with aiosqlite.connect(temp_db) as conn:
+    async with conn.execute("SELECT COUNT(*) FROM requests") as cursor:
+      assert (await cursor.fetchone())[0] == 6
+
+
+@pytest.mark.asyncio
+async def test_connection_pool(temp_db, sample_response, sample_request_data):
+  """Test writes and queries through the shared write connection and read pool."""
+  db = Database(temp_db)
+  await db.init()
+  await db.connect(read_pool_size=2)
+  try:
+    await db.log_request('gpt-4', 'openai', sample_response, 100, sample_request_data)
+    await db.log_request('gpt-4', 'openai', None, 50, sample_request_data, error='Timeout: too slow')
+
+    stats = await db.get_stats()
+    assert stats['totals']['requests'] == 1
+    assert len(stats['recent_errors']) == 1
+
+    await db.clear_errors()
+    stats = await db.get_stats()
+    assert stats['recent_errors'] == []
+  finally:
+    await db.close()
+
+  # Closed pool falls back to per-operation connections
+  stats = await db.get_stats()
+  assert stats['totals']['requests'] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_hourly_stats_zero_fill(temp_db, sample_response, sample_request_data):
+  """Test hourly stats return all 24 hours with traffic grouped per hour."""
+  db = Database(temp_db)
+  await db.init()
+  await db.log_requests_batch([
+    Database.build_request_row('gpt-4', 'openai', sample_response, 100, sample_request_data,
+                               timestamp='2025-10-06T09:15:00Z'),
+    Database.build_request_row('gpt-4', 'openai', sample_response, 100, sample_request_data,
+                               timestamp='2025-10-06T09:45:00Z'),
+    Database.build_request_row('gpt-4', 'openai', sample_response, 100, sample_request_data,
+                               timestamp='2025-10-06T17:00:00Z'),
+  ])
+
+  result = await db.get_hourly_stats('2025-10-06T00:00:00', '2025-10-07T00:00:00')
+
+  assert [entry['hour'] for entry in result['hourly']] == list(range(24))
+  assert result['hourly'][0] == {'hour': 0, 'requests': 0, 'cost': 0.0, 'total_tokens': 0, 'by_model': []}
+  assert result['hourly'][9]['requests'] == 2
+  assert result['hourly'][9]['by_model'][0]['model'] == 'gpt-4'
+  assert result['hourly'][17]['requests'] == 1
+  assert result['total_requests'] == 3
+
+  # Local hours at UTC-08:00
+  result = await db.get_hourly_stats('2025-10-06T08:00:00', '2025-10-07T08:00:00', -480)
+  assert [(entry['hour'], entry['requests']) for entry in result['hourly'] if entry['requests']] == [(1, 2), (9, 1)]
+
+
+@pytest.mark.asyncio
+async def test_get_daily_stats_from_buckets(temp_db, sample_response, sample_request_data):
+  """Test daily stats combine hour buckets with partial-hour edges."""
+  db = Database(temp_db)
+  await db.init()
+  await db.log_requests_batch([
+    Database.build_request_row('gpt-4', 'openai', sample_response, 100, sample_request_data,
+                               timestamp=timestamp)
+    for timestamp in ('2025-10-06T09:15:00.000Z', '2025-10-06T18:45:00.000Z',
+                      '2025-10-06T23:45:00.000Z', '2025-10-07T00:10:00.000Z')
+  ])
+
+  # 09:15 is before the range start, 00:10 falls in the partial last hour
+  result = await db.get_daily_stats('2025-10-06T09:30:00', '2025-10-07T00:20:00')
+  assert [(day['date'], day['requests']) for day in result['daily']] == [('2025-10-07', 1), ('2025-10-06', 2)]
+  assert result['daily'][0]['by_model'] == [{'provider': 'openai', 'model': 'gpt-4', 'requests': 1, 'cost': 0.0015}]
+  assert (result['daily'][1]['total_tokens'], result['daily'][1]['cost']) == (60, 0.003)
+  assert (result['total_requests'], result['total_days']) == (3, 2)
+
+  # At UTC+05:30, 18:45Z is already the next local day but its hour bucket is not
+  result = await db.get_daily_stats('2025-10-05T18:30:00', '2025-10-07T18:30:00', 330)
+  assert [(day['date'], day['requests']) for day in result['daily']] == [('2025-10-07', 3), ('2025-10-06', 1)]
+
+
+@pytest.mark.asyncio
+async def test_get_stats_from_buckets(temp_db, sample_response, sample_request_data):
+  """Test stats combine hourly buckets with partial-hour edges exactly."""
+  db = Database(temp_db)
+  await db.init()
+  rows = [
+    Database.build_request_row('gpt-4', 'openai', sample_response, duration, sample_request_data,
+                               cost=0.01, timestamp=timestamp)
+    for timestamp, duration in [
+      ('2025-10-06T08:59:59Z', 100), ('2025-10-06T09:15:00Z', 200), ('2025-10-06T09:45:00Z', 300),
+      ('2025-10-06T10:00:00Z', 400), ('2025-10-06T11:30:00Z', 500),
+    ]
+  ]
+  rows.append(Database.build_request_row('claude-3', None, sample_response, 100, sample_request_data,
+                                         cost=0.02, timestamp='2025-10-06T10:30:00Z'))
+  rows.append(Database.build_request_row('gpt-4', 'openai', None, 100, sample_request_data,
+                                         error='Timeout', timestamp='2025-10-06T10:30:00Z'))
+  await db.log_requests_batch(rows)
+
+  async with aiosqlite.connect(temp_db) as conn:
+    async with conn.execute("SELECT hour_ts, provider, requests FROM stats_bucket ORDER BY 1, 2") as cursor:
+      assert await cursor.fetchall() == [
+        ('2025-10-06T08', 'openai', 1), ('2025-10-06T09', 'openai', 2),
+        ('2025-10-06T10', '', 1), ('2025-10-06T10', 'openai', 1), ('2025-10-06T11', 'openai', 1),
+      ]
+
+  stats = await db.get_stats()
+  assert stats['totals']['requests'] == 6
+  assert stats['totals']['cost'] == 0.07
+  assert stats['by_model'][1] == {'model': 'claude-3', 'provider': None, 'requests': 1, 'cost': 0.02, 'tokens': 30}
+  assert [p['provider'] for p in stats['by_provider']] == ['openai', None]
+  assert len(stats['recent_errors']) == 1
+
+  # 09:10 to 11:00: a partial hour, then hour 10 from its bucket
+  stats = await db.get_stats('2025-10-06T09:10:00', '2025-10-06T11:00:00')
+  assert stats['totals']['requests'] == 4
+  assert stats['totals']['avg_duration_ms'] == 250.0
+  # 20 completion tokens in 200, 300 and 400 ms
+  assert [p['model'] for p in stats['performance']] == ['claude-3', 'gpt-4']
+  assert stats['performance'][1] == {
+    'model': 'gpt-4', 'requests': 3, 'avg_tokens_per_sec': 72.22, 'avg_duration_ms': 300.0,
+    'min_tokens_per_sec': 50.0, 'max_tokens_per_sec': 100.0, 'avg_cost_per_request': 0.01
+  }
+
+  # Within a single hour only requests rows are read
+  stats = await db.get_stats('2025-10-06T09:00:00Z', '2025-10-06T09:30:00Z')
+  assert stats['totals']['requests'] == 1
+
+  # Missing or outdated buckets are rebuilt from the requests on init
+  async with aiosqlite.connect(temp_db) as conn:
+    await conn.execute("DROP TABLE stats_bucket")
+    await conn.execute("CREATE TABLE stats_bucket (hour_ts TEXT, model TEXT, provider TEXT, requests INTEGER)")
+    await conn.commit()
+  await db.init()
+  stats = await db.get_stats('2025-10-06T09:10:00')
+  assert stats['totals']['requests'] == 5
+  assert stats['performance'][1]['min_tokens_per_sec'] == 40.0
+
+
+@pytest.mark.asyncio
+async def test_get_requests_pagination(temp_db, sample_response, sample_request_data):
+  """Test offset and keyset pages cover every row once, newest first."""
+  db = Database(temp_db)
+  await db.init()
+  # Three rows share a timestamp, so paging relies on the id tie-break
+  timestamps = ['2025-10-06T09:00:00Z'] * 3 + ['2025-10-06T10:00:00Z', '2025-10-06T11:00:00Z']
+  await db.log_requests_batch([
+    Database.build_request_row(f'model-{i}', 'openai', sample_response, 100, sample_request_data, timestamp=timestamp)
+    for i, timestamp in enumerate(timestamps)
+  ])
+
+  pages = [await db.get_requests(RequestFilter(offset=offset, limit=2)) for offset in (0, 2, 4)]
+  assert [r['model'] for page in pages for r in page['requests']] == [
+    'model-4', 'model-3', 'model-2', 'model-1', 'model-0'
+  ]
+  assert pages[0]['total'] == 5
+  assert 'model' in json.loads(pages[0]['requests'][0]['request_data'])
+
+  result = await db.get_requests(RequestFilter(before='2025-10-06T10:00:00Z'))
+  assert [r['model'] for r in result['requests']] == ['model-2', 'model-1', 'model-0']
+  assert result['total'] == 3
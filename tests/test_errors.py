@@ -1,7 +1,8 @@
 """Unit tests for error response formatting."""
 
 import pytest
-from apantli.errors import build_error_response, extract_error_message
+from litellm.exceptions import ContextWindowExceededError, RateLimitError
+from apantli.errors import build_error_response, extract_error_message, get_error_details
 
 
 def test_build_error_response_basic():
@@ -157,3 +158,15 @@ def test_extract_error_message_fallback():
 
   # Should return original message when no pattern matches
   assert result == error_str
+
+
+def test_get_error_details():
+  """Test mapped types, their subclasses, and unknown errors."""
+  rate_limit = RateLimitError(message='slow down', llm_provider='openai', model='gpt-4')
+  assert get_error_details(rate_limit) == (429, "rate_limit_error", "rate_limit_exceeded")
+
+  # Subclass of BadRequestError, matched through isinstance
+  context = ContextWindowExceededError(message='too long', model='gpt-4', llm_provider='openai')
+  assert get_error_details(context) == (400, "invalid_request_error", "bad_request")
+
+  assert get_error_details(ValueError('boom')) == (500, "api_error", "internal_error")
@@ -0,0 +1,310 @@
+"""Unit tests for server request helpers."""
+
+import asyncio
+import json
+import logging
+import time
+from types import SimpleNamespace
+import aiosqlite
+import pytest
+from fastapi import HTTPException
+from litellm.types.utils import ModelResponseStream, StreamingChoices, Delta, Usage
+from apantli.config import Config
+from apantli.database import Database
+from apantli.server import (
+  DashboardFilter, ModelOperationError, apply_add_model, apply_delete_model, apply_model_operations,
+  apply_update_model, build_model_templates, build_obsidian_export, build_pricing_index,
+  build_provider_indexes, refresh_model_state, resolve_model_config, filter_parameters_for_model,
+  execute_streaming_request
+)
+
+
+@pytest.fixture
+def model_map():
+  """Provide a model map as built by Config.get_model_map()."""
+  return {
+    'gpt-4': {
+      'model': 'openai/gpt-4',
+      'api_key': 'sk-test-openai',
+      'enabled': True,
+      'timeout': None,
+      'num_retries': None,
+      'temperature': 0.7,
+    },
+    'claude-3': {
+      'model': 'anthropic/claude-3-opus-20240229',
+      'api_key': '',
+      'enabled': True,
+      'timeout': 180,
+      'num_retries': 5,
+    },
+  }
+
+
+def test_build_model_templates(model_map):
+  """Test templates carry API keys and bake in global defaults."""
+  templates = build_model_templates(model_map, timeout=120, retries=3)
+
+  assert templates['gpt-4'] == {
+    'model': 'openai/gpt-4',
+    'api_key': 'sk-test-openai',
+    'timeout': 120,
+    'num_retries': 3,
+    'temperature': 0.7,
+  }
+  # Empty (unset) key is left out; config timeout/retries win over globals
+  assert 'api_key' not in templates['claude-3']
+  assert templates['claude-3']['timeout'] == 180
+  assert templates['claude-3']['num_retries'] == 5
+  assert 'enabled' not in templates['claude-3']
+
+
+def test_resolve_model_config_merges_template(model_map):
+  """Test config values fill gaps while client values win."""
+  templates = build_model_templates(model_map, timeout=120, retries=3)
+
+  client_data = {'model': 'gpt-4', 'messages': [], 'temperature': 0.2, 'timeout': None, 'api_key': 'client'}
+  request_data = resolve_model_config('gpt-4', client_data, templates)
+
+  assert request_data['model'] == 'openai/gpt-4'
+  assert request_data['api_key'] == 'sk-test-openai'
+  assert request_data['temperature'] == 0.2
+  assert request_data['timeout'] == 120
+  assert request_data['num_retries'] == 3
+  assert None not in request_data.values()
+  assert client_data['model'] == 'gpt-4'
+
+
+def test_resolve_model_config_unknown_model(model_map):
+  """Test unknown models raise 404 listing available models."""
+  templates = build_model_templates(model_map, timeout=120, retries=3)
+
+  with pytest.raises(HTTPException) as exc_info:
+    resolve_model_config('gpt-5', {'model': 'gpt-5'}, templates)
+
+  assert exc_info.value.status_code == 404
+  assert 'claude-3, gpt-4' in exc_info.value.detail
+
+
+def test_resolve_model_config_disabled_model(temp_config_file, monkeypatch):
+  """Test disabled models raise 403."""
+  monkeypatch.setenv('OPENAI_API_KEY', 'sk-test')
+  with open(temp_config_file, 'w') as f:
+    f.write("""model_list:
+  - model_name: gpt-4
+    litellm_params:
+      model: openai/gpt-4
+      api_key: os.environ/OPENAI_API_KEY
+      enabled: false
+""")
+  config = Config(temp_config_file)
+  templates = build_model_templates(config.get_model_map(), timeout=120, retries=3)
+
+  with pytest.raises(HTTPException) as exc_info:
+    resolve_model_config('gpt-4', {'model': 'gpt-4'}, templates, config.get_enabled_models())
+
+  assert exc_info.value.status_code == 403
+
+
+def test_build_obsidian_export(temp_config_file, monkeypatch):
+  """Test the Obsidian export lists enabled models with per-million pricing."""
+  monkeypatch.setenv('OPENAI_API_KEY', 'sk-test')
+  with open(temp_config_file, 'w') as f:
+    f.write("""model_list:
+  - model_name: gpt-4
+    litellm_params:
+      model: openai/gpt-4
+      api_key: os.environ/OPENAI_API_KEY
+  - model_name: gpt-4-off
+    litellm_params:
+      model: openai/gpt-4
+      api_key: os.environ/OPENAI_API_KEY
+      enabled: false
+""")
+  config = Config(temp_config_file)
+  export = build_obsidian_export(build_pricing_index(config.get_model_map()), config.get_enabled_models())
+
+  assert 'base_url' not in export and 'exported_at' not in export
+  assert [m['id'] for m in export['models']] == ['gpt-4']
+  model = export['models'][0]
+  assert model['provider'] == 'openai'
+  assert model['input_cost_per_million'] == 30.0
+  assert model['output_cost_per_million'] == 60.0
+
+
+def test_apply_model_operations(temp_config_file, sample_config_content, monkeypatch):
+  """Test add/update/delete helpers validate before changing the models dict."""
+  monkeypatch.setenv('OPENAI_API_KEY', 'sk-test')
+  monkeypatch.setenv('ANTHROPIC_API_KEY', 'sk-ant-test')
+  with open(temp_config_file, 'w') as f:
+    f.write(sample_config_content)
+  models = dict(Config(temp_config_file).models)
+
+  apply_add_model(models, {'model_name': 'gpt-4o', 'litellm_model': 'gpt-4o', 'api_key_env': 'OPENAI_API_KEY'})
+  assert models['gpt-4o'].litellm_model == 'gpt-4o'
+
+  updated, fields = apply_update_model(models, 'gpt-4', {'enabled': False, 'model': 'ignored'})
+  assert fields == ['enabled']
+  assert models['gpt-4'] is updated and not updated.enabled
+
+  apply_delete_model(models, 'claude-3')
+  assert sorted(models) == ['gpt-4', 'gpt-4o']
+
+  with pytest.raises(ModelOperationError) as exc_info:
+    apply_add_model(models, {'model_name': 'gpt-4', 'litellm_model': 'gpt-4', 'api_key_env': 'OPENAI_API_KEY'})
+  assert exc_info.value.status_code == 400
+
+  with pytest.raises(ModelOperationError) as exc_info:
+    apply_update_model(models, 'gpt-4', {'timeout': -1})
+  assert exc_info.value.status_code == 400
+  assert models['gpt-4'] is updated
+
+  with pytest.raises(ModelOperationError) as exc_info:
+    apply_delete_model(models, 'claude-3')
+  assert exc_info.value.status_code == 404
+
+  with pytest.raises(ModelOperationError) as exc_info:
+    apply_model_operations(models, [{'op': 'delete', 'model_name': 'gpt-4o'}, {'op': 'rename'}])
+  assert exc_info.value.message == 'Operation 1: Unknown op: rename'
+
+
+def test_refresh_model_state_single_model(temp_config_file, sample_config_content, monkeypatch):
+  """Test refreshing after one model changed reuses the other models' entries."""
+  monkeypatch.setenv('OPENAI_API_KEY', 'sk-test')
+  monkeypatch.setenv('ANTHROPIC_API_KEY', 'sk-ant-test')
+  with open(temp_config_file, 'w') as f:
+    f.write(sample_config_content)
+  state = SimpleNamespace(config=Config(temp_config_file), timeout=120, retries=3)
+  refresh_model_state(state)
+  previous = state.snapshot
+  assert previous.available_models == ' Available models: claude-3, gpt-4'
+
+  models = dict(state.config.models)
+  apply_update_model(models, 'gpt-4', {'enabled': False, 'temperature': 0.2})
+  state.config.models = models
+  refresh_model_state(state, changed_model='gpt-4')
+
+  snapshot = state.snapshot
+  assert snapshot.model_map['claude-3'] is previous.model_map['claude-3']
+  assert snapshot.model_templates['claude-3'] is previous.model_templates['claude-3']
+  assert snapshot.model_templates['gpt-4']['temperature'] == 0.2
+  assert snapshot.enabled_models == frozenset({'claude-3'})
+  assert snapshot.available_models is previous.available_models
+  assert snapshot.model_providers == {'gpt-4': 'openai', 'claude-3': 'anthropic'}
+  assert [m['id'] for m in snapshot.obsidian_export['models']] == ['claude-3']
+
+
+def test_filter_parameters_for_model():
+  """Test strict Anthropic models drop top_p when temperature is set."""
+  request_data = filter_parameters_for_model(
+    {'model': 'anthropic/claude-opus-4-1-20250805', 'temperature': 0.5, 'top_p': 0.9}
+  )
+  assert request_data == {'model': 'anthropic/claude-opus-4-1-20250805', 'temperature': 0.5}
+
+  request_data = filter_parameters_for_model({'model': 'openai/gpt-4', 'temperature': 0.5, 'top_p': 0.9})
+  assert request_data['top_p'] == 0.9
+
+
+@pytest.mark.asyncio
+async def test_execute_streaming_request_logs_accumulated_response(temp_db):
+  """Test streamed chunks are forwarded as SSE and logged as one response."""
+  db = Database(temp_db)
+  await db.init()
+  chunks = [
+    ModelResponseStream(id='chatcmpl-1', model='gpt-4', choices=[StreamingChoices(delta=Delta(content='Hel'))]),
+    ModelResponseStream(id='chatcmpl-1', model='gpt-4', choices=[StreamingChoices(delta=Delta(content='lo'), finish_reason='stop')]),
+    ModelResponseStream(id='chatcmpl-1', model='gpt-4', choices=[],
+                        usage=Usage(prompt_tokens=3, completion_tokens=2, total_tokens=5)),
+  ]
+  request_data = {'model': 'openai/gpt-4', 'messages': [], 'stream': True}
+
+  async def stream():
+    for chunk in chunks:
+      yield chunk
+
+  response = await execute_streaming_request(
+    stream(), 'gpt-4', request_data, time.monotonic_ns(), db
+  )
+  body = b''.join([part async for part in response.body_iterator])
+  await response.background()
+
+  assert response.headers['x-accel-buffering'] == 'no'
+  events = body.decode().strip().split('\n\n')
+  assert events[-1] == 'data: [DONE]'
+  assert json.loads(events[0][len('data: '):])['choices'][0]['delta']['content'] == 'Hel'
+
+  async with aiosqlite.connect(temp_db) as conn:
+    async with conn.execute("SELECT response_data FROM requests") as cursor:
+      row = await cursor.fetchone()
+  logged = json.loads(row[0])
+  assert logged['choices'][0]['message']['content'] == 'Hello'
+  assert logged['choices'][0]['finish_reason'] == 'stop'
+  assert logged['usage']['total_tokens'] == 5
+
+
+@pytest.mark.asyncio
+async def test_execute_streaming_request_pings_while_idle(temp_db, monkeypatch):
+  """Test a silent provider gets SSE comment pings without losing chunks."""
+  monkeypatch.setattr('apantli.server.SSE_PING_INTERVAL', 0.01)
+  db = Database(temp_db)
+  await db.init()
+  request_data = {'model': 'openai/gpt-4', 'messages': [], 'stream': True}
+
+  async def stream():
+    yield ModelResponseStream(id='chatcmpl-1', model='gpt-4', choices=[StreamingChoices(delta=Delta(content='Hel'))])
+    await asyncio.sleep(0.05)
+    yield ModelResponseStream(id='chatcmpl-1', model='gpt-4', choices=[StreamingChoices(delta=Delta(content='lo'))])
+
+  response = await execute_streaming_request(stream(), 'gpt-4', request_data, time.monotonic_ns(), db)
+  events = b''.join([part async for part in response.body_iterator]).decode().strip().split('\n\n')
+
+  assert ': ping' in events
+  data = [json.loads(e[len('data: '):]) for e in events if e.startswith('data: {')]
+  assert [d['choices'][0]['delta']['content'] for d in data] == ['Hel', 'lo']
+  assert events[-1] == 'data: [DONE]'
+
+
+def test_dashboard_filter():
+  """Test dashboard polling is dropped from access logs and API calls are kept."""
+  log_filter = DashboardFilter()
+
+  def access_record(method, path):
+    return logging.LogRecord(
+      'uvicorn.access', logging.INFO, __file__, 0,
+      '%s - "%s %s HTTP/%s" %d', ('127.0.0.1:5000', method, path, '1.1', 200), None
+    )
+
+  assert not log_filter.filter(access_record('GET', '/'))
+  assert not log_filter.filter(access_record('GET', '/stats?hours=24'))
+  assert not log_filter.filter(access_record('GET', '/static/js/dashboard.js'))
+  assert log_filter.filter(access_record('GET', '/stats/hourly?date=2025-10-06'))
+  assert log_filter.filter(access_record('POST', '/v1/chat/completions'))
+
+  # Records without access-log args fall back to the formatted message
+  plain = logging.LogRecord('uvicorn.access', logging.INFO, __file__, 0, 'GET /health HTTP/1.1', None, None)
+  assert not log_filter.filter(plain)
+
+
+def test_build_provider_indexes():
+  """Test provider counts and per-provider model lists from the cost map."""
+  cost_map = {
+    'gpt-4': {'input_cost_per_token': 0.00003, 'output_cost_per_token': 0.00006, 'max_tokens': 8192},
+    'openai/gpt-4o': {'input_cost_per_token': 0.0000025, 'output_cost_per_token': 0.00001},
+    'openai/o3': {'input_cost_per_token': 0.000002, 'output_cost_per_token': 0.000008},
+    'claude-3-opus-20240229': {'input_cost_per_token': 0.000015, 'output_cost_per_token': 0.000075},
+    'some-local-model': {},
+  }
+
+  providers, provider_models = build_provider_indexes(cost_map)
+
+  assert [p['name'] for p in providers['providers']] == ['openai', 'anthropic', 'other']
+  assert providers['providers'][0] == {
+    'name': 'openai', 'display_name': 'OpenAI (GPT)', 'model_count': 3, 'popular': True
+  }
+  assert 'other' not in provider_models
+
+  openai_models = provider_models['openai']
+  assert openai_models['count'] == 3
+  # Popular models sort first, then by name
+  assert [m['name'] for m in openai_models['models']] == ['gpt-4', 'gpt-4o', 'o3']
+  assert openai_models['models'][0]['input_cost_per_million'] == 30.0
@@ -1,8 +1,8 @@
 """Unit tests for utility functions."""
 
 import pytest
-from datetime import datetime, timedelta
-from apantli.utils import convert_local_date_to_utc_range
+from datetime import datetime, timedelta, timezone
+from apantli.utils import convert_local_date_to_utc_range, build_utc_range, build_time_filter, default_date_range
 
 
 def test_convert_local_date_to_utc_range_pst():
@@ -97,3 +97,46 @@ def test_convert_local_date_to_utc_range_leap_year():
   # Should handle leap day correctly
   assert start_utc == "2024-02-29T08:00:00"
   assert end_utc == "2024-03-01T08:00:00"
+
+
+def test_build_utc_range():
+  """Test inclusive local date ranges become half-open UTC ranges."""
+  # PST: local days map to 08:00 UTC boundaries, end day is inclusive
+  assert build_utc_range("2025-10-06", "2025-10-07", -480) == (
+    "2025-10-06T08:00:00", "2025-10-08T08:00:00"
+  )
+  # No offset: plain midnight boundaries
+  assert build_utc_range("2025-10-06", "2025-10-06") == (
+    "2025-10-06T00:00:00", "2025-10-07T00:00:00"
+  )
+
+
+def test_build_time_filter_returns_fresh_params():
+  """Test cached time filters hand each caller its own parameter list."""
+  clause, params = build_time_filter(start_date='2025-10-06', end_date='2025-10-06', timezone_offset=-480)
+  assert clause == "AND timestamp >= ? AND timestamp < ?"
+  assert params == ['2025-10-06T08:00:00', '2025-10-07T08:00:00']
+
+  params.append('extra')
+  assert build_time_filter(start_date='2025-10-06', end_date='2025-10-06', timezone_offset=-480)[1] == [
+    '2025-10-06T08:00:00', '2025-10-07T08:00:00'
+  ]
+  assert build_time_filter() == ("", [])
+
+
+def test_default_date_range(monkeypatch):
+  """Test the default stats range covers the last 30 days in UTC."""
+  # 2025-10-06T23:30:00Z
+  monkeypatch.setattr('apantli.utils.time.time', lambda: 1759793400.0)
+  assert default_date_range() == ('2025-09-06', '2025-10-06')
+  assert default_date_range(7) == ('2025-09-29', '2025-10-06')
+
+
+def test_build_time_filter_hours():
+  """Test the hours filter binds a UTC cutoff instead of calling datetime() per row."""
+  before = datetime.now(timezone.utc) - timedelta(hours=24)
+  clause, params = build_time_filter(hours=24)
+
+  assert clause == "AND timestamp >= ?"
+  cutoff = datetime.fromisoformat(params[0]).replace(tzinfo=timezone.utc)
+  assert abs((cutoff - before).total_seconds()) < 5
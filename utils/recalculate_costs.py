@@ -63,6 +63,39 @@ def normalize_model_name(model_name: str) -> str:
     return f"{provider}/{model_name}"
 
 
+def rebuild_stats_bucket(cursor):
+    """Recompute the server's hourly stats rollup from the requests table.
+
+    Same aggregation as BACKFILL_STATS_BUCKET_SQL in apantli/database.py.
+    """
+    cursor.execute("PRAGMA table_info(stats_bucket)")
+    if 'tps_max' not in {row[1] for row in cursor.fetchall()}:
+        return  # Created (or rebuilt) and filled by the server on its next start
+    cursor.execute("DELETE FROM stats_bucket")
+    cursor.execute("""
+        INSERT INTO stats_bucket
+        (hour_ts, model, provider, requests, cost, prompt_tokens, completion_tokens,
+         total_tokens, duration_ms_sum, perf_requests, perf_cost, perf_duration_ms_sum,
+         tps_sum, tps_min, tps_max)
+        SELECT substr(timestamp, 1, 13), model, COALESCE(provider, ''), COUNT(*),
+               COALESCE(SUM(cost), 0), COALESCE(SUM(prompt_tokens), 0),
+               COALESCE(SUM(completion_tokens), 0), COALESCE(SUM(total_tokens), 0),
+               COALESCE(SUM(duration_ms), 0), COUNT(tps),
+               COALESCE(SUM(cost) FILTER (WHERE tps IS NOT NULL), 0),
+               COALESCE(SUM(duration_ms) FILTER (WHERE tps IS NOT NULL), 0),
+               COALESCE(SUM(tps), 0), MIN(tps), MAX(tps)
+        FROM (
+            SELECT timestamp, model, provider, cost, prompt_tokens, completion_tokens,
+                   total_tokens, duration_ms,
+                   CASE WHEN completion_tokens > 0 AND duration_ms > 0
+                   THEN completion_tokens * 1000.0 / duration_ms END AS tps
+            FROM requests
+            WHERE error IS NULL
+        )
+        GROUP BY 1, 2, 3
+    """)
+
+
 def recalculate_costs(dry_run=False):
     """Recalculate costs for all requests with cost = 0 or NULL."""
     conn = sqlite3.connect(DB_PATH)
@@ -131,6 +164,9 @@ def recalculate_costs(dry_run=False):
             failed += 1
 
     if not dry_run:
+        # /stats totals are summed from the rollup, so refresh it in the
+        # same transaction as the new costs
+        rebuild_stats_bucket(cursor)
         conn.commit()
         print(f"\n✅ Updated {updated} requests")
     else: